@@ -0,0 +1,54 @@
+import random
+import numpy as np
+
+
+def build_alias_table(weights):
+    """
+    Build Walker/Vose alias tables (prob, alias) for O(1) weighted sampling.
+    Falls back to a uniform table when the total weight is not positive.
+    """
+    n = len(weights)
+    prob = np.ones(n)
+    alias = np.arange(n)
+    total = float(np.sum(weights))
+    if n == 0 or total <= 0:
+        return prob, alias
+    
+    scaled = np.asarray(weights, dtype=np.float64) * (n / total)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+    
+    # Leftovers are 1.0 up to rounding error
+    return prob, alias
+
+
+class AliasSampler:
+    """Fixed weighted index sampler with O(N) setup and O(1) draws from the random module."""
+    
+    __slots__ = ('prob', 'alias')
+    
+    def __init__(self, weights):
+        """Build alias tables for the given non-negative weights."""
+        prob, alias = build_alias_table(weights)
+        self.prob = prob.tolist()
+        self.alias = alias.tolist()
+    
+    def __len__(self):
+        """Number of indices the sampler draws from."""
+        return len(self.prob)
+    
+    def sample(self):
+        """Draw one index with probability proportional to its weight."""
+        i = random.randrange(len(self.prob))
+        return i if random.random() < self.prob[i] else self.alias[i]
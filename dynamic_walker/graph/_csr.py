@@ -0,0 +1,80 @@
+import numpy as np
+from ._walk_kernel import njit
+
+
+def build_csr(adj):
+    """
+    Snapshot an adjacency mapping into CSR arrays in one pass per array, with int32 offsets and indices.
+    Returns (nodes, node_index, indptr, indices, slots) where slots holds each entry's edge slot.
+    """
+    nodes = list(adj)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    
+    degrees = np.fromiter((len(adj[n]) for n in nodes), dtype=np.int64, count=len(nodes))
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int32)
+    np.cumsum(degrees, out=indptr[1:])
+    num_entries = int(indptr[-1])
+    
+    indices = np.fromiter(
+        (node_index[v] for n in nodes for v in adj[n]),
+        dtype=np.int32, count=num_entries
+    )
+    slots = np.fromiter(
+        (data['slot'] for n in nodes for data in adj[n].values()),
+        dtype=np.int64, count=num_entries
+    )
+    return nodes, node_index, indptr, indices, slots
+
+
+@njit(cache=True, fastmath=True)
+def aging_weights(nodes, birth, activity, time_step, decay_pow):
+    """Attachment weight decay**age * (0.6 + 0.4 * activity) per node id, ages looked up in decay_pow."""
+    out = np.empty(len(nodes), np.float64)
+    for i in range(len(nodes)):
+        node = nodes[i]
+        out[i] = decay_pow[time_step - birth[node]] * (0.6 + 0.4 * activity[node])
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def aging_edge_scores(endpoints, birth, activity, time_step, decay_pow):
+    """Triadic score decay**age * mean activity per edge slot, -inf for freed (-1) slots."""
+    out = np.full(len(endpoints), -np.inf)
+    for i in range(len(endpoints)):
+        u = endpoints[i, 0]
+        v = endpoints[i, 1]
+        if u < 0:
+            continue
+        age = time_step - min(birth[u], birth[v])
+        out[i] = decay_pow[age] * (activity[u] + activity[v]) / 2
+    return out
+
+
+@njit(cache=True)
+def weighted_sample_k(weights, k, uniforms):
+    """
+    Pick up to k distinct indices with Efraimidis-Spirakis keys log(u) / w.
+    Non-positive weights are never picked, so fewer than k indices come back when they run out.
+    """
+    n = len(weights)
+    keys = np.empty(n, np.float64)
+    positive = 0
+    for i in range(n):
+        if weights[i] > 0:
+            keys[i] = np.log1p(-uniforms[i]) / weights[i]
+            positive += 1
+        else:
+            keys[i] = -np.inf
+    k = min(k, positive)
+    if k == 0:
+        return np.empty(0, np.int64)
+    return np.argpartition(keys, n - k)[n - k:]
+
+
+@njit(cache=True)
+def age_arrays(activity, edge_w, node_aging, edge_aging, min_activity):
+    """Scale activities (clamped at min_activity) and edge weights in place, one read per element."""
+    for i in range(len(activity)):
+        activity[i] = max(activity[i] * node_aging, min_activity)
+    for i in range(len(edge_w)):
+        edge_w[i] *= edge_aging
@@ -0,0 +1,206 @@
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels stay importable without numba."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Teleport strategy codes understood by the kernel
+TELEPORT_UNIFORM = 0
+TELEPORT_COMPONENT = 1
+TELEPORT_DISTANT = 2
+
+TELEPORT_CODES = {
+    "component": TELEPORT_COMPONENT,
+    "distant": TELEPORT_DISTANT,
+}
+
+
+@njit(cache=True)
+def _bfs_levels(indptr, indices, source, cutoff, dist, queue):
+    """Fill dist with hop counts from source (-1 when unreached), stopping at cutoff."""
+    dist[:] = -1
+    dist[source] = 0
+    head = 0
+    tail = 1
+    queue[0] = source
+    while head < tail:
+        node = queue[head]
+        head += 1
+        if cutoff >= 0 and dist[node] >= cutoff:
+            continue
+        for k in range(indptr[node], indptr[node + 1]):
+            other = indices[k]
+            if dist[other] < 0:
+                dist[other] = dist[node] + 1
+                queue[tail] = other
+                tail += 1
+
+
+@njit(cache=True)
+def _teleport_candidates(indptr, indices, current, strategy, max_distance, row_comp, dist, queue, out):
+    """
+    Write teleport candidates for current into out and return their count.
+    Component strategies read the per-row component labels instead of searching.
+    """
+    n = len(indptr) - 1
+    count = 0
+    if strategy == TELEPORT_COMPONENT or strategy == TELEPORT_DISTANT:
+        label = row_comp[current]
+        inside = strategy == TELEPORT_COMPONENT
+        for node in range(n):
+            if (row_comp[node] == label) == inside:
+                out[count] = node
+                count += 1
+    elif max_distance <= 0:
+        for node in range(n):
+            out[count] = node
+            count += 1
+    else:
+        _bfs_levels(indptr, indices, current, max_distance, dist, queue)
+        for node in range(n):
+            if dist[node] >= 0:
+                out[count] = node
+                count += 1
+    return count
+
+
+@njit(cache=True)
+def _weighted_pick(cumulative, count, u):
+    """Binary search a cumulative weight buffer with uniform u, uniform fallback on zero total."""
+    total = cumulative[count - 1]
+    if total <= 0:
+        return min(int(u * count), count - 1)
+    target = u * total
+    lo = 0
+    hi = count - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cumulative[mid] > target:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+@njit(cache=True)
+def _row_cdf(indptr, indices, bias, min_w, exploration):
+    """Per-row cumulative neighbor weights for non-adaptive walks, accumulated as _walk_step does."""
+    cdf = np.empty(len(indices), np.float64)
+    for row in range(len(indptr) - 1):
+        acc = 0.0
+        for k in range(indptr[row], indptr[row + 1]):
+            acc += max(min_w, bias[indices[k]]) ** exploration
+            cdf[k] = acc
+    return cdf
+
+
+@njit(cache=True)
+def _walk_step(indptr, indices, bias, row_cdf, row_comp, current, u_teleport, u_stay, u_pick,
+               teleport_p, stay_p, exploration, decay, min_w, adaptive,
+               strategy, max_distance, visits, dist, queue, candidates, cumulative):
+    """
+    Advance the walk by one step from row current using three uniforms.
+    Non-adaptive walks sample neighbors from the precomputed row_cdf.
+    Returns the new row and whether the walker moved.
+    """
+    begin = indptr[current]
+    end = indptr[current + 1]
+    teleport = u_teleport < teleport_p
+    if not teleport:
+        if u_stay < stay_p:
+            visits[current] += 1
+            return current, False
+        # Force teleport if no neighbors available
+        teleport = begin == end
+
+    if teleport:
+        count = _teleport_candidates(indptr, indices, current, strategy,
+                                     max_distance, row_comp, dist, queue, candidates)
+        if count == 0:
+            return current, False
+        acc = 0.0
+        for k in range(count):
+            weight = bias[candidates[k]]
+            if adaptive:
+                weight *= decay ** visits[candidates[k]]
+            acc += max(min_w, weight)
+            cumulative[k] = acc
+        current = candidates[_weighted_pick(cumulative, count, u_pick)]
+    elif not adaptive:
+        current = indices[begin + _weighted_pick(row_cdf[begin:end], end - begin, u_pick)]
+    else:
+        acc = 0.0
+        for k in range(begin, end):
+            weight = bias[indices[k]] * decay ** visits[indices[k]]
+            acc += max(min_w, weight) ** exploration
+            cumulative[k - begin] = acc
+        current = indices[begin + _weighted_pick(cumulative, end - begin, u_pick)]
+
+    visits[current] += 1
+    return current, True
+
+
+@njit(cache=True)
+def _walk_kernel(indptr, indices, bias, row_cdf, row_comp, start, u_teleport, u_stay, u_pick,
+                 teleport_p, stay_p, exploration, decay, min_w, adaptive,
+                 strategy, max_distance, visits, path_out):
+    """
+    Run one walk step per entry of the pre-drawn uniform arrays on CSR arrays.
+    Returns the final row and the number of moves written to path_out.
+    """
+    n = len(indptr) - 1
+    dist = np.empty(n, np.int64)
+    queue = np.empty(n, np.int64)
+    candidates = np.empty(n, np.int64)
+    cumulative = np.empty(n, np.float64)
+
+    current = start
+    moves = 0
+    for t in range(len(u_pick)):
+        current, moved = _walk_step(indptr, indices, bias, row_cdf, row_comp, current,
+                                    u_teleport[t], u_stay[t], u_pick[t],
+                                    teleport_p, stay_p, exploration, decay, min_w,
+                                    adaptive, strategy, max_distance, visits,
+                                    dist, queue, candidates, cumulative)
+        if moved:
+            path_out[moves] = current
+            moves += 1
+
+    return current, moves
+
+
+@njit(cache=True)
+def _walk_ensemble(indptr, indices, bias, row_cdf, row_comp, starts, u_teleport, u_stay, u_pick,
+                   teleport_p, stay_p, exploration, decay, min_w, adaptive,
+                   strategy, max_distance, walks_out):
+    """
+    Run one independent walk per start row, each with fresh visit counts.
+    walks_out[i, t] receives the row occupied after t steps of walk i.
+    """
+    n = len(indptr) - 1
+    visits = np.zeros(n, np.int32)
+    dist = np.empty(n, np.int64)
+    queue = np.empty(n, np.int64)
+    candidates = np.empty(n, np.int64)
+    cumulative = np.empty(n, np.float64)
+
+    for i in range(len(starts)):
+        visits[:] = 0
+        current = starts[i]
+        visits[current] = 1
+        walks_out[i, 0] = current
+        for t in range(walks_out.shape[1] - 1):
+            current, _ = _walk_step(indptr, indices, bias, row_cdf, row_comp, current,
+                                    u_teleport[i, t], u_stay[i, t], u_pick[i, t],
+                                    teleport_p, stay_p, exploration, decay, min_w,
+                                    adaptive, strategy, max_distance, visits,
+                                    dist, queue, candidates, cumulative)
+            walks_out[i, t + 1] = current
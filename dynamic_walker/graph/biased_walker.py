@@ -1,10 +1,37 @@
+import os
 import random
-from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
+import numpy as np
+from ._alias import build_alias_table
+from ._walk_kernel import (NUMBA_AVAILABLE, TELEPORT_CODES, TELEPORT_UNIFORM,
+                           _row_cdf, _walk_ensemble, _walk_kernel)
+
+
+def _run_walk_chunk(csr, params, starts, length, seed):
+    """Run a chunk of independent walks on a CSR snapshot (process pool worker)."""
+    indptr, indices, bias, row_cdf, row_comp = csr
+    rng = np.random.default_rng(seed)
+    shape = (len(starts), length - 1)
+    walks = np.empty((len(starts), length), dtype=np.int64)
+    _walk_ensemble(indptr, indices, bias, row_cdf, row_comp, starts,
+                   rng.random(shape), rng.random(shape), rng.random(shape),
+                   *params, walks)
+    return walks
+
 
 class BiasedRandomWalker:
     """Implements a biased random walker with teleportation capabilities for graph exploration."""
     
+    __slots__ = (
+        'graph', 'bias_type', 'max_history', '_path_ring', '_path_idx', '_visit_arr',
+        '_total_visits',
+        'stay_probability', 'teleport_probability', 'exploration_factor',
+        'decay_factor', 'adaptive_bias', 'min_weight', 'max_teleport_distance',
+        'teleport_strategy', '_bias_cache_version', '_bias_cache', '_row_cdf_version', '_row_cdf',
+        'current_node', 'custom_bias', '_rng'
+    )
+    
     def __init__(self, graph, 
                  bias_type="weight",
                  max_history=100,
@@ -16,15 +43,18 @@ class BiasedRandomWalker:
                  adaptive_bias=True,
                  min_weight=0.1,
                  max_teleport_distance=0,
-                 teleport_strategy="uniform"):
+                 teleport_strategy="uniform",
+                 seed=None):
         """
         Initialize the random walker with specified parameters.
         """
         self.graph = graph
         self.bias_type = bias_type
         self.max_history = max_history
-        self.path = deque(maxlen=max_history)
-        self.visit_count = {}
+        self._path_ring = np.empty(max_history, dtype=np.int64)
+        self._path_idx = 0
+        self._visit_arr = np.zeros(graph.node_counter, dtype=np.int32)
+        self._total_visits = 0
         self.stay_probability = stay_probability
         self.teleport_probability = teleport_probability
         self.exploration_factor = exploration_factor
@@ -33,6 +63,11 @@ class BiasedRandomWalker:
         self.min_weight = min_weight
         self.max_teleport_distance = max_teleport_distance
         self.teleport_strategy = teleport_strategy
+        self._bias_cache_version = -1
+        self._bias_cache = None
+        self._row_cdf_version = -1
+        self._row_cdf = None
+        self._rng = np.random.default_rng(seed)
         
         self.current_node = self._init_start_node(start_node)
 
@@ -51,141 +86,349 @@ class BiasedRandomWalker:
             node = None
             
         if node is not None:
-            self.path.append(node)
-            self.visit_count[node] = 1
+            self._append_path(node)
+            self._record_visit(node)
         return node
 
     def reset(self, start_node=None):
         """Reset the walker's state and optionally set new start node."""
-        self.path.clear()
-        self.visit_count.clear()
+        self._path_idx = 0
+        self._visit_arr[:] = 0
+        self._total_visits = 0
         self.current_node = self._init_start_node(start_node)
 
+    def _grow_visit(self, size):
+        """Grow the dense visit counter so it can be indexed by ids below size."""
+        if size > len(self._visit_arr):
+            grown = np.zeros(max(size, 2 * len(self._visit_arr)), dtype=np.int32)
+            grown[:len(self._visit_arr)] = self._visit_arr
+            self._visit_arr = grown
+
+    def _record_visit(self, node):
+        """Count a visit to node in the dense visit array."""
+        if node >= len(self._visit_arr):
+            self._grow_visit(node + 1)
+        self._visit_arr[node] += 1
+        self._total_visits += 1
+
+    def _append_path(self, node):
+        """Append node to the fixed-size path ring buffer."""
+        self._path_ring[self._path_idx % self.max_history] = node
+        self._path_idx += 1
+
+    def _extend_path(self, nodes):
+        """Append an array of nodes to the path ring buffer."""
+        nodes = nodes[-self.max_history:]
+        positions = (self._path_idx + np.arange(len(nodes))) % self.max_history
+        self._path_ring[positions] = nodes
+        self._path_idx += len(nodes)
+
+    def _move_to(self, node):
+        """Move the walker to node, recording it in the path and visit counts."""
+        self.current_node = node
+        self._append_path(node)
+        self._record_visit(node)
+
+    @property
+    def path(self):
+        """Most recent visited nodes (up to max_history), oldest first."""
+        count = min(self._path_idx, self.max_history)
+        positions = np.arange(self._path_idx - count, self._path_idx) % self.max_history
+        return self._path_ring[positions].tolist()
+
+    @property
+    def visit_count(self):
+        """Visit counts per visited node, built from the dense counter on demand."""
+        visited = np.flatnonzero(self._visit_arr)
+        return dict(zip(visited.tolist(), self._visit_arr[visited].tolist()))
+
     def _get_teleport_candidates(self):
         """Get candidate nodes for teleportation based on current strategy."""
-        G = self.graph.G
-        current_node = self.current_node
-        
-        if not G.nodes:
-            return []
-        
-        if current_node not in G:
-            return list(G.nodes)
-        
-        # Component-aware strategies
-        if self.teleport_strategy == "component":
-            component = nx.node_connected_component(G, current_node)
-            return list(component)
-        
-        if self.teleport_strategy == "distant":
-            current_component = nx.node_connected_component(G, current_node)
-            return [n for n in G.nodes if n not in current_component]
-        
-        # Distance-limited teleportation
-        if self.max_teleport_distance <= 0:
-            return list(G.nodes)
-        
-        try:
-            distances = nx.single_source_shortest_path_length(
-                G, current_node, cutoff=self.max_teleport_distance
-            )
-            return list(distances.keys())
-        except nx.NodeNotFound:
-            return list(G.nodes)
+        return self.graph.get_teleport_candidates(
+            self.current_node, self.max_teleport_distance, self.teleport_strategy
+        )
 
     def _get_node_weight(self, node):
         """Calculate weight for a node considering bias type and visit history."""
         weight = 1.0
         
         if self.bias_type == "weight":
-            edges = self.graph.G.edges(node, data='weight', default=1.0)
+            edges = self.graph.G.adj[node]
             if edges:
-                weight = sum(w for _, _, w in edges) / len(edges)
+                weight = sum(self.graph.edge_w_arr[data['slot']] for data in edges.values()) / len(edges)
         elif self.bias_type == "degree":
             weight = self.graph.G.degree(node)
         elif self.bias_type == "activity":
-            weight = self.graph.G.nodes[node].get('activity', 1.0)
+            weight = self.graph.activity_arr[node]
         elif self.bias_type == "custom" and hasattr(self, 'custom_bias'):
             weight = self.custom_bias(node)
         
         # Apply adaptive bias based on visit counts
         if self.adaptive_bias:
-            visit_count = self.visit_count.get(node, 0)
+            visit_count = self._visit_arr[node] if node < len(self._visit_arr) else 0
             weight *= (self.decay_factor ** visit_count)
         
         return max(self.min_weight, weight)
 
+    def _get_bias_vector(self, indptr, edge_w):
+        """Get base bias for every CSR row, cached per CSR snapshot."""
+        graph = self.graph
+        if self._bias_cache_version == graph.csr_version:
+            return self._bias_cache
+        
+        degrees = np.diff(indptr)
+        if self.bias_type == "weight":
+            rows = np.repeat(np.arange(len(degrees)), degrees)
+            sums = np.bincount(rows, weights=edge_w, minlength=len(degrees))
+            bias = np.ones(len(degrees))
+            np.divide(sums, degrees, out=bias, where=degrees > 0)
+        elif self.bias_type == "degree":
+            bias = degrees.astype(np.float64)
+        elif self.bias_type == "activity":
+            bias = graph.activity_arr[graph.index_node]
+        else:
+            bias = np.ones(len(degrees))
+        
+        self._bias_cache = bias
+        self._bias_cache_version = graph.csr_version
+        return bias
+
+    def _get_row_cdf(self, indptr, indices, bias):
+        """Get per-row neighbor CDFs for the walk kernel, cached per CSR snapshot (unused when adaptive)."""
+        if self.adaptive_bias:
+            return np.empty(0)
+        if self._row_cdf_version != self.graph.csr_version:
+            self._row_cdf = _row_cdf(indptr, indices, bias, self.min_weight, self.exploration_factor)
+            self._row_cdf_version = self.graph.csr_version
+        return self._row_cdf
+
+    def _get_row_components(self):
+        """Get per-row component labels for component teleports in the kernel, empty otherwise."""
+        if self.teleport_strategy in ("component", "distant"):
+            return self.graph.get_row_components()
+        return np.empty(0, dtype=np.int64)
+
+    def _get_neighbor_weights(self, rows, indptr, edge_w):
+        """Calculate selection weights for the given CSR rows."""
+        nodes = self.graph.index_node[rows]
+        if self.bias_type == "custom" and hasattr(self, 'custom_bias'):
+            weights = np.fromiter((self.custom_bias(n) for n in nodes), dtype=np.float64, count=len(nodes))
+        else:
+            weights = self._get_bias_vector(indptr, edge_w)[rows]
+        
+        if self.adaptive_bias:
+            self._grow_visit(self.graph.node_counter)
+            weights = weights * np.power(self.decay_factor, self._visit_arr[nodes])
+        
+        return np.power(np.maximum(weights, self.min_weight), self.exploration_factor)
+
+    @staticmethod
+    def _pick_index(weights, u):
+        """Map a uniform draw u onto a weighted index, uniform if the total is not positive."""
+        cumulative = np.cumsum(weights)
+        total_weight = cumulative[-1]
+        if total_weight <= 0:
+            return min(int(u * len(cumulative)), len(cumulative) - 1)
+        return min(int(cumulative.searchsorted(u * total_weight, side='right')), len(cumulative) - 1)
+
+    def _sample_alias(self, node, rows, indptr, edge_w, u):
+        """Pick a neighbor position in O(1) from the node's cached alias table."""
+        graph = self.graph
+        key = (self.bias_type, self.min_weight, self.exploration_factor)
+        
+        # Uniform aging keeps the table valid while no neighbor bias falls to a clamp floor
+        if self.bias_type == "weight":
+            log_scale, floor = graph.edge_log_scale, self.min_weight
+        elif self.bias_type == "activity":
+            log_scale, floor = graph.activity_log_scale, max(self.min_weight, graph.MIN_ACTIVITY)
+        else:
+            log_scale, floor = 0.0, 0.0
+        
+        entry = graph._alias.get(node)
+        if (entry is None or entry[0] != key or
+                (log_scale != entry[3] and entry[4] * np.exp(log_scale - entry[3]) < floor)):
+            bias = self._get_bias_vector(indptr, edge_w)[rows]
+            prob, alias = build_alias_table(self._get_neighbor_weights(rows, indptr, edge_w))
+            entry = (key, prob, alias, log_scale, float(bias.min()))
+            graph._alias[node] = entry
+        
+        # One uniform supplies both the column and the coin flip
+        prob, alias = entry[1], entry[2]
+        scaled = u * len(prob)
+        i = min(int(scaled), len(prob) - 1)
+        return i if scaled - i < prob[i] else int(alias[i])
+
+    def _teleport(self, u):
+        """Jump to a weighted teleport candidate, returning the new node or None."""
+        candidates = self._get_teleport_candidates()
+        if not len(candidates):
+            return None
+        
+        get_weight = self._get_node_weight
+        weights = [get_weight(int(node)) for node in candidates]
+        next_node = int(candidates[self._pick_index(weights, u)])
+        self._move_to(next_node)
+        return next_node
+
     def step(self):
         """Perform one step of the random walk with teleportation."""
-        G = self.graph.G
+        rnd = random.random
+        self._step(rnd(), rnd(), rnd())
+
+    def _step(self, u_teleport, u_stay, u_pick):
+        """Perform one walk step driven by three uniform draws."""
+        graph = self.graph
+        G = graph.G
+        current_node = self.current_node
         
         if not G.nodes:
             self.current_node = None
             return
         
         # Handle case where current node was removed
-        if self.current_node not in G:
-            self.current_node = random.choice(list(G.nodes)) if G.nodes else None
-            if self.current_node:
-                self.path.append(self.current_node)
-                self.visit_count[self.current_node] = self.visit_count.get(self.current_node, 0) + 1
+        if current_node not in G:
+            nodes = graph.get_nodes_array()
+            self._move_to(int(nodes[min(int(u_pick * len(nodes)), len(nodes) - 1)]))
             return
 
         # Teleportation logic
-        if random.random() < self.teleport_probability:
-            candidates = self._get_teleport_candidates()
-            if candidates:
-                weights = [self._get_node_weight(node) for node in candidates]
-                total_weight = sum(weights)
-                
-                if total_weight > 0:
-                    next_node = random.choices(candidates, weights=weights)[0]
-                else:
-                    next_node = random.choice(candidates)
-                
-                self.current_node = next_node
-                self.path.append(next_node)
-                self.visit_count[next_node] = self.visit_count.get(next_node, 0) + 1
+        if u_teleport < self.teleport_probability:
+            self._teleport(u_pick)
             return
 
         # Stay probability
-        if random.random() < self.stay_probability:
-            self.visit_count[self.current_node] += 1
+        if u_stay < self.stay_probability:
+            self._record_visit(current_node)
             return
 
-        # Standard random walk step
-        neighbors = list(G.neighbors(self.current_node))
-        if not neighbors:
+        # Standard random walk step over the CSR snapshot
+        indptr, indices, edge_w = graph.get_csr()
+        i = graph.node_index[current_node]
+        start, end = indptr[i], indptr[i + 1]
+        if start == end:
             # Force teleport if no neighbors available
-            self.teleport_probability = 1.0
-            self.step()
-            self.teleport_probability = 0.1  # Reset to default
+            self._teleport(u_pick)
             return
 
-        # Calculate weights with exploration factor
-        weights = []
-        for neighbor in neighbors:
-            weight = self._get_node_weight(neighbor)
-            weights.append(weight ** self.exploration_factor)
+        # Select next node based on weights with exploration factor
+        rows = indices[start:end]
+        if not self.adaptive_bias and self.bias_type != "custom":
+            # Weights only change with the graph, so the alias table is reusable
+            idx = self._sample_alias(current_node, rows, indptr, edge_w, u_pick)
+        else:
+            idx = self._pick_index(self._get_neighbor_weights(rows, indptr, edge_w), u_pick)
+        self._move_to(int(graph.index_node[rows[idx]]))
 
-        # Select next node based on weights
-        total_weight = sum(weights)
-        if total_weight <= 0:
-            next_node = random.choice(neighbors)
+    def run(self, n_steps, uniforms=None):
+        """
+        Perform n_steps walk steps, batched in a compiled kernel when numba is available.
+        Adaptive walkers take the same path as the Python step for equal uniforms; non-adaptive
+        walkers sample neighbors from alias tables in Python and row CDFs in the kernel, so
+        those two paths agree in distribution only.
+        uniforms optionally supplies a pre-drawn (3, n_steps) array of teleport, stay and pick draws.
+        """
+        if n_steps <= 0:
+            return
+        
+        # Draw all uniforms for the walk up front from the walker's generator
+        if uniforms is None:
+            uniforms = self._rng.random((3, n_steps))
+        u_teleport, u_stay, u_pick = uniforms
+        
+        first = 0
+        if self.current_node is not None and self.current_node not in self.graph.G:
+            self._step(u_teleport[0], u_stay[0], u_pick[0])
+            first = 1
+        
+        custom = self.bias_type == "custom" and hasattr(self, 'custom_bias')
+        if not NUMBA_AVAILABLE or custom or self.current_node is None:
+            step = self._step
+            for k in range(first, n_steps):
+                step(u_teleport[k], u_stay[k], u_pick[k])
+            return
+        
+        graph = self.graph
+        indptr, indices, edge_w = graph.get_csr()
+        bias = self._get_bias_vector(indptr, edge_w)
+        self._grow_visit(graph.node_counter)
+        visits = self._visit_arr[graph.index_node]
+        visits_before = int(visits.sum())
+        path_out = np.empty(n_steps - first, dtype=np.int64)
+        
+        last, moves = _walk_kernel(
+            indptr, indices, bias, self._get_row_cdf(indptr, indices, bias),
+            self._get_row_components(), graph.node_index[self.current_node],
+            u_teleport[first:], u_stay[first:], u_pick[first:],
+            self.teleport_probability, self.stay_probability, self.exploration_factor,
+            self.decay_factor, self.min_weight, self.adaptive_bias,
+            TELEPORT_CODES.get(self.teleport_strategy, TELEPORT_UNIFORM),
+            self.max_teleport_distance, visits, path_out
+        )
+        
+        # Write kernel state back to the Python-side history
+        self._extend_path(graph.index_node[path_out[:moves]])
+        self._visit_arr[graph.index_node] = visits
+        self._total_visits += int(visits.sum()) - visits_before
+        self.current_node = int(graph.index_node[last])
+
+    def run_walks(self, start_nodes, length, max_workers=None):
+        """
+        Run one independent walk of `length` positions from each start node.
+        Walks are spread over a process pool on a read-only snapshot of the graph,
+        each with fresh visit counts, and returned as a (len(start_nodes), length) array.
+        """
+        if length < 1:
+            raise ValueError(f"Walk length must be positive: {length}")
+        
+        graph = self.graph
+        indptr, indices, edge_w = graph.get_csr()
+        try:
+            starts = np.array([graph.node_index[n] for n in start_nodes], dtype=np.int64)
+        except KeyError as error:
+            raise ValueError(f"Unknown start node: {error.args[0]}") from None
+        
+        if self.bias_type == "custom" and hasattr(self, 'custom_bias'):
+            # Custom bias is evaluated once per node for the snapshot
+            bias = np.fromiter((self.custom_bias(n) for n in graph.index_node.tolist()),
+                               dtype=np.float64, count=len(graph.index_node))
+        else:
+            bias = self._get_bias_vector(indptr, edge_w)
+        
+        if self.adaptive_bias:
+            row_cdf = np.empty(0)
+        else:
+            row_cdf = _row_cdf(indptr, indices, bias, self.min_weight, self.exploration_factor)
+        csr = (indptr, indices, bias, row_cdf, self._get_row_components())
+        params = (
+            self.teleport_probability, self.stay_probability, self.exploration_factor,
+            self.decay_factor, self.min_weight, self.adaptive_bias,
+            TELEPORT_CODES.get(self.teleport_strategy, TELEPORT_UNIFORM),
+            self.max_teleport_distance
+        )
+        
+        workers = max_workers or os.cpu_count() or 1
+        chunks = [chunk for chunk in np.array_split(starts, workers) if len(chunk)]
+        seeds = np.random.SeedSequence(int(self._rng.integers(2 ** 63))).spawn(len(chunks))
+        
+        if len(chunks) <= 1:
+            results = [_run_walk_chunk(csr, params, chunk, length, seed)
+                       for chunk, seed in zip(chunks, seeds)]
         else:
-            next_node = random.choices(neighbors, weights=weights)[0]
+            with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                futures = [executor.submit(_run_walk_chunk, csr, params, chunk, length, seed)
+                           for chunk, seed in zip(chunks, seeds)]
+                results = [future.result() for future in futures]
         
-        # Update walker state
-        self.current_node = next_node
-        self.path.append(next_node)
-        self.visit_count[next_node] = self.visit_count.get(next_node, 0) + 1
+        if not results:
+            return np.empty((0, length), dtype=np.int64)
+        return graph.index_node[np.concatenate(results)]
 
     def get_visit_distribution(self):
         """Calculate normalized visit frequencies for all visited nodes."""
-        total_visits = sum(self.visit_count.values())
-        if total_visits == 0:
+        if self._total_visits == 0:
             return {}
-        return {node: count / total_visits for node, count in self.visit_count.items()}
+        visited = np.flatnonzero(self._visit_arr)
+        return dict(zip(visited.tolist(), (self._visit_arr[visited] / self._total_visits).tolist()))
     
     def set_custom_bias(self, bias_function):
         """Set a custom bias function for node selection."""
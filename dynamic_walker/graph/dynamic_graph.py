@@ -1,11 +1,20 @@
 import networkx as nx
+import numpy as np
 import random
 import heapq
+import threading
+from collections import OrderedDict
 from .strategies.strategy_factory import StrategyFactory
+from .union_find import UnionFind
+from ._csr import build_csr, age_arrays
+from ._walk_kernel import NUMBA_AVAILABLE
 
 class DynamicGraph:
     """A dynamic graph that evolves over time with configurable growth strategies."""
     
+    # Floor that node activity never decays below
+    MIN_ACTIVITY = 0.1
+    
     def __init__(self, strategy="preferential", **config):
         """Initialize the graph with given strategy and configuration."""
         self.G = nx.Graph()
@@ -15,18 +24,64 @@ class DynamicGraph:
         self.strategy_name = strategy
         self.components_dirty = True
         self._components = None
-        self._activity_heap = []
-        self._node_activity = {}
+        self._uf = UnionFind()
+        self._uf_dirty = True
+        
+        # Component id per entry of the node array, grouped for O(1) component lookups
+        self._comp_version = -1
+        self._comp_ids = np.empty(0, dtype=np.int64)
+        self._comp_nodes = np.empty(0, dtype=np.int64)
+        self._comp_bounds = {}
+        self._comp_outside = {}
+        self._row_comp_version = -1
+        self._row_comp = np.empty(0, dtype=np.int64)
+        
+        # Struct-of-arrays node and edge attributes, indexed by node id / edge slot.
+        # Edge weights only feed sampling probabilities, so they default to float32.
+        self.activity_arr = np.zeros(0, dtype=np.float64)
+        self.birth_arr = np.zeros(0, dtype=np.int64)
+        self.edge_w_arr = np.zeros(0, dtype=config.get('weight_dtype', np.float32))
+        self._edge_endpoints = np.zeros((0, 2), dtype=np.int64)
+        self._free_edge_slots = []
+        self._edge_slot_count = 0
+        
+        # CSR snapshot of the adjacency, rebuilt lazily for walkers. Weight-only changes
+        # (aging) re-gather _edge_w through the cached slots instead of rebuilding the topology.
+        self.csr_dirty = True
+        self.csr_version = 0
+        self.node_index = {}
+        self.index_node = np.empty(0, dtype=np.int64)
+        self._indptr = np.zeros(1, dtype=np.int32)
+        self._indices = np.empty(0, dtype=np.int32)
+        self._edge_w = np.empty(0, dtype=self.edge_w_arr.dtype)
+        self._csr_slots = np.empty(0, dtype=np.int64)
+        self._csr_graph_version = -1
+        self._nodes_dirty = True
+        self._nodes_arr = np.empty(0, dtype=np.int64)
+        
+        # Topology version and LRU cache of teleport candidates shared across walkers
+        self._graph_version = 0
+        self._teleport_cache = OrderedDict()
+        self._teleport_cache_version = 0
+        self._teleport_lock = threading.Lock()
+        
+        # Nodes and edge counters for the current update, reported back by update()
+        self.last_added_nodes = []
+        self.last_added_edges = []
+        self._edges_removed = 0
+        
+        # Per-node alias tables for non-adaptive walkers, dropped when the neighborhood changes.
+        # Aging scales all weights uniformly, so tables stay valid across it; the cumulative
+        # log aging factors let walkers tell when a clamp floor would break that proportionality.
+        self._alias = {}
+        self.edge_log_scale = 0.0
+        self.activity_log_scale = 0.0
         
         self.strategy = StrategyFactory.create(strategy, self, config)
         
         self.target_components = config.get('target_components', 1)
         self.min_component_size = config.get('min_component_size', 3)
         
-        nx.set_node_attributes(self.G, 0.0, 'activity')
-        nx.set_node_attributes(self.G, 0, 'birth_step')
-        nx.set_edge_attributes(self.G, 0.0, 'weight')
-        
         if config.get('initial_nodes', 0) > 0:
             self._initialize_graph()
     
@@ -37,12 +92,15 @@ class DynamicGraph:
             self._create_multicomponent_graph(num_nodes)
         else:
             self._create_single_component_graph(num_nodes)
-        self.node_counter = num_nodes
+        self.node_counter = max(self.node_counter, num_nodes)
+        self._nodes_dirty = True
+        self._uf_dirty = True
+        self._graph_version += 1
     
     def _create_single_component_graph(self, num_nodes):
         """Create a single connected component graph."""
         self.G = nx.connected_watts_strogatz_graph(num_nodes, k=4, p=0.6, tries=100)
-        nx.set_edge_attributes(self.G, 1.0, 'weight')
+        self._register_edges(self.G.edges(data=True), 1.0)
         
         for node in self.G.nodes:
             self._init_node(node)
@@ -51,20 +109,20 @@ class DynamicGraph:
     def _create_multicomponent_graph(self, num_nodes):
         """Create graph with multiple components."""
         component_sizes = self._balanced_component_sizes(num_nodes)
-        self.G = nx.empty_graph(0)
         
-        for i, size in enumerate(component_sizes):
+        comp_graphs = []
+        for size in component_sizes:
             comp_graph = nx.connected_watts_strogatz_graph(size, k=3, p=0.6, tries=100)
-            nx.set_edge_attributes(comp_graph, 1.0, 'weight')
-            
-            comp_graph = nx.relabel_nodes(comp_graph, {n: n + self.node_counter for n in comp_graph.nodes})
-            self.G = nx.union(self.G, comp_graph)
-            
-            for node in comp_graph.nodes:
-                self._init_node(node)
-                self.strategy.pre_attach(node)
-            
+            comp_graphs.append(nx.convert_node_labels_to_integers(comp_graph, first_label=self.node_counter))
             self.node_counter += size
+        
+        # Compose all components in one linear pass instead of repeated unions
+        self.G = nx.union_all(comp_graphs) if comp_graphs else nx.empty_graph(0)
+        self._register_edges(self.G.edges(data=True), 1.0)
+        
+        for node in self.G.nodes:
+            self._init_node(node)
+            self.strategy.pre_attach(node)
     
     def _balanced_component_sizes(self, total_nodes):
         """Calculate balanced component sizes distribution."""
@@ -78,26 +136,84 @@ class DynamicGraph:
 
     def _init_node(self, node):
         """Initialize node with activity tracking."""
+        if node >= len(self.activity_arr):
+            size = max(node + 1, 2 * len(self.activity_arr))
+            self.activity_arr = np.resize(self.activity_arr, size)
+            self.birth_arr = np.resize(self.birth_arr, size)
+        
         activity = 1.0
-        self.G.nodes[node]['activity'] = activity
-        self.G.nodes[node]['birth_step'] = self.time_step
-        self._node_activity[node] = activity
-        heapq.heappush(self._activity_heap, (activity, node))
+        self.activity_arr[node] = activity
+        self.birth_arr[node] = self.time_step
+    
+    def _alloc_edge_slot(self, u, v, weight):
+        """Reserve an edge slot in the weight/endpoint arrays and return its index."""
+        if self._free_edge_slots:
+            slot = self._free_edge_slots.pop()
+        else:
+            slot = self._edge_slot_count
+            self._edge_slot_count += 1
+            if slot >= len(self.edge_w_arr):
+                size = max(16, 2 * len(self.edge_w_arr))
+                self.edge_w_arr = np.resize(self.edge_w_arr, size)
+                self._edge_endpoints = np.resize(self._edge_endpoints, (size, 2))
+        
+        self.edge_w_arr[slot] = weight
+        self._edge_endpoints[slot] = (u, v)
+        return slot
+    
+    def _free_edge_slot(self, slot):
+        """Release an edge slot for reuse."""
+        self._edge_endpoints[slot] = -1
+        self.edge_w_arr[slot] = np.inf
+        self._free_edge_slots.append(slot)
+    
+    def _register_edges(self, edges, weight):
+        """Assign weight slots to edges created outside _add_edge."""
+        for u, v, data in edges:
+            data['slot'] = self._alloc_edge_slot(u, v, weight)
+    
+    def edge_weight(self, u, v):
+        """Get the current (aged) weight of edge (u, v)."""
+        return float(self.edge_w_arr[self.G.adj[u][v]['slot']])
+    
+    def get_edge_endpoints(self):
+        """Get (u, v) rows for every allocated edge slot, freed slots hold -1."""
+        return self._edge_endpoints[:self._edge_slot_count]
+    
+    def sync_attributes(self):
+        """Copy array-backed activity, birth step and edge weight into G's attribute dicts."""
+        for node, data in self.G.nodes(data=True):
+            data['activity'] = float(self.activity_arr[node])
+            data['birth_step'] = int(self.birth_arr[node])
+        for _, _, data in self.G.edges(data=True):
+            data['weight'] = float(self.edge_w_arr[data['slot']])
     
     def _add_edge(self, u, v, weight=1.0):
         """Add edge between nodes with weight."""
         if u == v or self.G.has_edge(u, v):
             return False
         
-        self.G.add_edge(u, v, weight=weight)
+        self.G.add_edge(u, v, slot=self._alloc_edge_slot(u, v, weight))
+        self.last_added_edges.append((u, v))
+        self._invalidate_alias(u, v)
+        if not self._uf_dirty:
+            self._uf.union(u, v)
         self.components_dirty = True
+        self._graph_version += 1
+        self.csr_dirty = True
         return True
     
     def _remove_edge(self, u, v):
         """Remove edge between nodes."""
         if self.G.has_edge(u, v):
+            self._invalidate_alias(u, v)
+            self._free_edge_slot(self.G.adj[u][v]['slot'])
             self.G.remove_edge(u, v)
+            self._edges_removed += 1
             self.components_dirty = True
+            self._check_split([(u, v)])
+            self._graph_version += 1
+            self.csr_dirty = True
             return True
         return False
     
@@ -108,31 +224,126 @@ class DynamicGraph:
         node_aging = self.config.get('node_aging_factor', 0.99)
         edge_aging = self.config.get('edge_aging_factor', 0.97)
         
-        node_activities = {node: max(0.1, data['activity'] * node_aging)
-                          for node, data in self.G.nodes(data=True)}
-        nx.set_node_attributes(self.G, node_activities, 'activity')
-        
-        self._node_activity.update(node_activities)
-        
-        edge_weights = {(u, v): data['weight'] * edge_aging
-                       for u, v, data in self.G.edges(data=True)}
-        nx.set_edge_attributes(self.G, edge_weights, 'weight')
+        activity = self.activity_arr[:self.node_counter]
+        edge_w = self.edge_w_arr[:self._edge_slot_count]
+        if NUMBA_AVAILABLE:
+            # Fused pass over the live prefix of both arrays
+            age_arrays(activity, edge_w, node_aging, edge_aging, self.MIN_ACTIVITY)
+        else:
+            # In-place ufuncs beat the interpreted kernel loop
+            np.multiply(activity, node_aging, out=activity)
+            np.maximum(activity, self.MIN_ACTIVITY, out=activity)
+            edge_w *= edge_aging
+        self.edge_log_scale += np.log(edge_aging)
+        self.activity_log_scale += np.log(node_aging)
+        self.csr_dirty = True
+    
+    def __getstate__(self):
+        """Pickle without the teleport cache lock, which cannot be serialized."""
+        state = self.__dict__.copy()
+        del state['_teleport_lock']
+        return state
+    
+    def __setstate__(self, state):
+        """Restore pickled state with a fresh teleport cache lock."""
+        self.__dict__.update(state)
+        self._teleport_lock = threading.Lock()
+    
+    def _invalidate_alias(self, *nodes):
+        """Drop alias tables whose neighbor weights depend on the given nodes."""
+        if not self._alias:
+            return
+        adj = self.G.adj
+        for node in nodes:
+            self._alias.pop(node, None)
+            for neighbor in adj[node]:
+                self._alias.pop(neighbor, None)
+    
+    def _rebuild_csr(self):
+        """Rebuild CSR arrays (indptr, indices, edge weights), reusing the topology if unchanged."""
+        if self._csr_graph_version != self._graph_version:
+            nodes, node_index, self._indptr, self._indices, self._csr_slots = build_csr(self.G.adj)
+            self.node_index = node_index
+            self.index_node = np.fromiter(nodes, dtype=np.int64, count=len(nodes))
+            self._csr_graph_version = self._graph_version
+        self._edge_w = self.edge_w_arr[self._csr_slots]
+        self.csr_version += 1
+        self.csr_dirty = False
+    
+    def get_csr(self):
+        """Get (indptr, indices, edge_weights) arrays, rebuilding them if stale."""
+        if self.csr_dirty:
+            self._rebuild_csr()
+        return self._indptr, self._indices, self._edge_w
+    
+    def get_nodes_array(self):
+        """Get node ids as an int array, rebuilt only after node additions/removals."""
+        if self._nodes_dirty:
+            self._nodes_arr = np.fromiter(self.G.nodes, dtype=np.int64, count=self.G.number_of_nodes())
+            self._nodes_dirty = False
+        return self._nodes_arr
+    
+    def get_teleport_candidates(self, node, cutoff=0, strategy="uniform"):
+        """
+        Get teleport candidates for a walker at node, shared by all walkers on this graph.
+        Component strategies use the union-find; distance balls are memoized per
+        (node, cutoff) until the topology changes.
+        """
+        nodes = self.get_nodes_array()
+        if node not in self.G:
+            return nodes
+        
+        if strategy == "component":
+            return self.nodes_in_component(self.component_of(node))
+        if strategy == "distant":
+            return self.nodes_outside_component(self.component_of(node))
+        if cutoff <= 0:
+            return nodes
+        
+        key = (node, cutoff)
+        cache = self._teleport_cache
+        with self._teleport_lock:
+            if self._teleport_cache_version != self._graph_version:
+                cache.clear()
+                self._teleport_cache_version = self._graph_version
+            candidates = cache.get(key)
+            if candidates is not None:
+                cache.move_to_end(key)
+                return candidates
+            version = self._graph_version
+        
+        distances = nx.single_source_shortest_path_length(self.G, node, cutoff=cutoff)
+        # Keep node-array order, the row order the walk kernel enumerates candidates in
+        candidates = nodes[np.fromiter((n in distances for n in nodes.tolist()), dtype=bool, count=len(nodes))]
+        
+        with self._teleport_lock:
+            if self._teleport_cache_version == version:
+                cache[key] = candidates
+                if len(cache) > self.config.get('teleport_cache_size', 256):
+                    cache.popitem(last=False)
+        return candidates
     
     def get_least_active_node(self):
-        """Get least active node using activity heap."""
-        while self._activity_heap:
-            activity, node = heapq.heappop(self._activity_heap)
-            current_activity = self._node_activity.get(node, -1)
-            if current_activity == activity and node in self.G:
-                heapq.heappush(self._activity_heap, (activity, node))
-                return node
-        return None
-    
-    def enforce_degree_limits(self):
+        """Get least active node from the activity array."""
+        # Aging scales every activity by the same factor, so no ordered index is needed
+        nodes = self.get_nodes_array()
+        if not len(nodes):
+            return None
+        return int(nodes[np.argmin(self.activity_arr[nodes])])
+    
+    def enforce_constraints(self, degrees=None):
+        """Apply degree limits and component rules from a single degree snapshot."""
+        if degrees is None:
+            degrees = dict(self.G.degree())
+        self.enforce_degree_limits(degrees)
+        self.enforce_component_rules()
+    
+    def enforce_degree_limits(self, degrees=None):
         """Ensure all nodes stay within configured degree limits."""
         min_degree = self.config.get('min_degree', 2)
         max_degree = self.config.get('max_degree', 15)
-        degrees = dict(self.G.degree())
+        if degrees is None:
+            degrees = dict(self.G.degree())
         
         nodes_to_boost = [n for n, d in degrees.items() if d < min_degree]
         for node in nodes_to_boost:
@@ -148,33 +359,22 @@ class DynamicGraph:
         if needed <= 0:
             return
         
-        components = self._get_components()
-        node_comp = next((comp for comp in components if node in comp), set())
-        
-        comp_dict = {}
-        for comp in components:
-            for n in comp:
-                comp_dict[n] = comp
-        
-        neighbors = set(self.G.neighbors(node))
-        non_neighbors = set(self.G.nodes) - neighbors - {node}
+        find = self._get_union_find().find
+        node_root = find(node)
         
-        candidates = []
-        for other in non_neighbors:
-            if self.G.degree(other) >= self.config.get('max_degree', 15):
-                continue
-                
-            priority = 1.5 if comp_dict.get(other, set()) != node_comp else 1.0
-            score = priority * self.G.nodes[other]['activity']
-            candidates.append((other, score))
-        
-        if candidates:
-            candidates.sort(key=lambda x: x[1], reverse=True)
-            for other, _ in candidates[:min(needed, len(candidates))]:
-                if self._add_edge(node, other):
-                    needed -= 1
-                    if needed <= 0:
-                        break
+        adj = self.G.adj
+        neighbors = adj[node]
+        max_degree = self.config.get('max_degree', 15)
+        activity = self.activity_arr
+        
+        # Single pass over the node array keeping only the top `needed` scores
+        candidates = (
+            ((1.5 if find(other) != node_root else 1.0) * activity[other], other)
+            for other in self.get_nodes_array().tolist()
+            if other != node and other not in neighbors and len(adj[other]) < max_degree
+        )
+        for _, other in heapq.nlargest(needed, candidates):
+            self._add_edge(node, other)
     
     def _reduce_connectivity(self, node, max_degree):
         """Reduce connectivity for over-connected node."""
@@ -183,9 +383,9 @@ class DynamicGraph:
             return
         
         candidates = []
-        for neighbor in self.G.neighbors(node):
-            weight = self.G.edges[node, neighbor]['weight']
-            activity = self.G.nodes[neighbor]['activity']
+        for neighbor, data in self.G.adj[node].items():
+            weight = self.edge_w_arr[data['slot']]
+            activity = self.activity_arr[neighbor]
             score = 0.4 * (1 - weight) + 0.6 * (1 - activity)
             candidates.append((neighbor, score))
         
@@ -194,16 +394,120 @@ class DynamicGraph:
             for neighbor, _ in candidates[:excess]:
                 self._remove_edge(node, neighbor)
     
+    def _get_union_find(self):
+        """Get the union-find over current edges, rebuilt only after edge/node removals."""
+        if self._uf_dirty:
+            uf = UnionFind(self.node_counter)
+            for u, v in self.G.edges():
+                uf.union(u, v)
+            self._uf = uf
+            self._uf_dirty = False
+        return self._uf
+    
+    def _check_split(self, removed_edges):
+        """Keep a clean union-find after edge removals unless one of them split a component."""
+        if self._uf_dirty:
+            return
+        # A removed edge on a cycle leaves its endpoints connected, so the partition is unchanged
+        if not all(self._still_connected(u, v) for u, v in removed_edges):
+            self._uf_dirty = True
+    
+    def _still_connected(self, u, v):
+        """
+        Check whether u and v are connected with a BFS from each end, always growing the side
+        that has reached fewer nodes, so a split costs O(smaller side) rather than O(component).
+        """
+        adj = self.G.adj
+        seen_a, seen_b = {u}, {v}
+        frontier_a, frontier_b = [u], [v]
+        while frontier_a and frontier_b:
+            if len(seen_a) > len(seen_b):
+                seen_a, seen_b = seen_b, seen_a
+                frontier_a, frontier_b = frontier_b, frontier_a
+            next_frontier = []
+            for node in frontier_a:
+                for neighbor in adj[node]:
+                    if neighbor in seen_b:
+                        return True
+                    if neighbor not in seen_a:
+                        seen_a.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier_a = next_frontier
+        # One side ran out of nodes without meeting the other
+        return False
+    
+    def number_connected_components(self):
+        """Count connected components from the union-find, O(1) unless it needs a rebuild."""
+        uf = self._get_union_find()
+        # Ids without a node (removed or never used) are untouched singletons in the forest
+        return uf.count - (len(uf.parent) - self.G.number_of_nodes())
+    
+    def _get_component_ids(self):
+        """Get union-find roots aligned with get_nodes_array(), rebuilt once per topology change."""
+        if self._comp_version != self._graph_version:
+            nodes = self.get_nodes_array()
+            find = self._get_union_find().find
+            comp_ids = np.fromiter((find(n) for n in nodes.tolist()), dtype=np.int64, count=len(nodes))
+            
+            order = np.argsort(comp_ids, kind='stable')
+            sorted_ids = comp_ids[order]
+            boundary = np.ones(len(nodes), dtype=bool)
+            boundary[1:] = sorted_ids[1:] != sorted_ids[:-1]
+            starts = np.flatnonzero(boundary)
+            ends = np.r_[starts[1:], len(nodes)]
+            
+            self._comp_ids = comp_ids
+            self._comp_nodes = nodes[order]
+            self._comp_bounds = dict(zip(sorted_ids[starts].tolist(), zip(starts.tolist(), ends.tolist())))
+            self._comp_outside = {}
+            self._comp_version = self._graph_version
+        return self._comp_ids
+    
+    def get_row_components(self):
+        """Get component ids aligned with the CSR rows, for the walk kernels."""
+        self.get_csr()
+        if self._row_comp_version != self._graph_version:
+            comp_ids = self._get_component_ids()
+            by_id = np.empty(self.node_counter, dtype=np.int64)
+            by_id[self._nodes_arr] = comp_ids
+            self._row_comp = by_id[self.index_node]
+            self._row_comp_version = self._graph_version
+        return self._row_comp
+    
+    def component_of(self, node):
+        """Get the component id (union-find root) of node."""
+        return self._get_union_find().find(node)
+    
+    def nodes_in_component(self, cid):
+        """Get the nodes of component cid as an array view."""
+        self._get_component_ids()
+        start, end = self._comp_bounds.get(cid, (0, 0))
+        return self._comp_nodes[start:end]
+    
+    def nodes_outside_component(self, cid):
+        """Get the nodes outside component cid, memoized until the topology changes."""
+        comp_ids = self._get_component_ids()
+        outside = self._comp_outside.get(cid)
+        if outside is None:
+            outside = self._nodes_arr[comp_ids != cid]
+            self._comp_outside[cid] = outside
+        return outside
+    
     def _get_components(self):
         """Get connected components with caching."""
         if self.components_dirty or self._components is None:
-            self._components = list(nx.connected_components(self.G))
+            find = self._get_union_find().find
+            groups = {}
+            for node in self.G:
+                groups.setdefault(find(node), set()).add(node)
+            self._components = list(groups.values())
             self.components_dirty = False
         return self._components
     
-    def enforce_component_rules(self):
+    def enforce_component_rules(self, components=None):
         """Ensure graph components follow configuration rules."""
-        components = self._get_components()
+        if components is None:
+            components = self._get_components()
         num_components = len(components)
         
         if num_components == self.target_components:
@@ -252,19 +556,29 @@ class DynamicGraph:
     def _find_best_bridge(self, component):
         """Find optimal bridge edge to split component."""
         subgraph = self.G.subgraph(component)
-        if len(component) > 100:
-            betweenness = nx.betweenness_centrality(subgraph, k=min(50, len(component)))
-        else:
-            betweenness = nx.betweenness_centrality(subgraph)
+        if subgraph.number_of_edges() == 0:
+            return None
         
-        edge_centrality = {}
-        for u, v in subgraph.edges():
-            edge_centrality[(u, v)] = (betweenness[u] + betweenness[v]) / 2
+        if len(component) > 1000:
+            edge = self._find_spectral_cut_edge(subgraph)
+            if edge is not None:
+                return edge
         
-        if not edge_centrality:
+        edge_centrality = nx.edge_betweenness_centrality(subgraph, k=min(50, len(component)), seed=0)
+        return max(edge_centrality, key=edge_centrality.get)
+    
+    def _find_spectral_cut_edge(self, subgraph):
+        """Pick the edge crossing the Fiedler-vector sign cut closest to the split point."""
+        try:
+            fiedler = nx.fiedler_vector(subgraph, seed=0)
+        except (ImportError, nx.NetworkXError):
             return None
         
-        return max(edge_centrality, key=edge_centrality.get)
+        value = dict(zip(subgraph.nodes, fiedler))
+        crossing = [(u, v) for u, v in subgraph.edges() if (value[u] < 0) != (value[v] < 0)]
+        if not crossing:
+            return None
+        return min(crossing, key=lambda e: abs(value[e[0]]) + abs(value[e[1]]))
     
     def _enforce_min_component_size(self, components):
         """Ensure all components meet minimum size requirement."""
@@ -282,54 +596,92 @@ class DynamicGraph:
             node_to = random.choice(list(largest_comp))
             self._add_edge(node_from, node_to)
     
-    def update(self, params):
-        """Main update method for graph evolution."""
+    def update(self, params, uniforms=None):
+        """
+        Main update method for graph evolution.
+        uniforms optionally supplies four pre-drawn draws for the node add, node remove,
+        triadic and edge remove decisions; otherwise they come from the random module.
+        Returns (nodes_added, nodes_removed, edges_added, edges_removed) for this step;
+        the added node ids and edges are kept in last_added_nodes and last_added_edges.
+        """
         self.time_step += 1
         self.update_activity()
+        self.last_added_nodes = []
+        self.last_added_edges = []
+        self._edges_removed = 0
+        nodes_removed = 0
+        if uniforms is None:
+            rnd = random.random
+            uniforms = (rnd(), rnd(), rnd(), rnd())
+        u_add, u_remove, u_triadic, u_edge_remove = uniforms
         
-        if random.random() < params.get('node_add_prob', 0.02):
-            self._add_node()
+        if u_add < params.get('node_add_prob', 0.02):
+            self.last_added_nodes.append(self._add_node())
         
-        if self.G.number_of_nodes() > 3 and random.random() < params.get('node_remove_prob', 0.005):
-            self._remove_inactive_node()
+        if self.G.number_of_nodes() > 3 and u_remove < params.get('node_remove_prob', 0.005):
+            nodes_removed += self._remove_inactive_node()
         
         if self.G.number_of_edges() > 0:
-            if random.random() < params.get('triadic_prob', 0.3):
+            if u_triadic < params.get('triadic_prob', 0.3):
                 self.strategy.add_triadic_edges()
             
-            if random.random() < params.get('edge_remove_prob', 0.1):
+            if u_edge_remove < params.get('edge_remove_prob', 0.1):
                 self._remove_aged_edges()
         
-        self.enforce_degree_limits()
-        self.enforce_component_rules()
+        self.enforce_constraints(dict(self.G.degree()))
         self.strategy.post_update()
+        return len(self.last_added_nodes), nodes_removed, len(self.last_added_edges), self._edges_removed
     
     def _add_node(self):
-        """Add new node to the graph."""
+        """Add new node to the graph and return its id."""
         new_node = self.node_counter
+        self.node_counter += 1
         self.G.add_node(new_node)
+        self._nodes_dirty = True
+        if not self._uf_dirty:
+            self._uf.add(new_node)
         self._init_node(new_node)
+        # Bump the topology version first so caches read during attach include the new node
+        self.components_dirty = True
+        self._graph_version += 1
+        self.csr_dirty = True
         self.strategy.pre_attach(new_node)
         self.strategy.attach(new_node)
-        self.components_dirty = True
-        self.node_counter += 1
+        return new_node
     
     def _remove_inactive_node(self):
-        """Remove least active node from the graph."""
+        """Remove least active node from the graph, returning how many nodes were removed."""
         node = self.get_least_active_node()
         if node is not None:
+            self._invalidate_alias(*self.G.adj[node])
+            self._invalidate_alias(node)
+            for data in self.G.adj[node].values():
+                self._free_edge_slot(data['slot'])
+            self._edges_removed += len(self.G.adj[node])
             self.G.remove_node(node)
             self.components_dirty = True
-            self._node_activity.pop(node, None)
+            self._uf_dirty = True
+            self._graph_version += 1
+            self.csr_dirty = True
+            self._nodes_dirty = True
+            return 1
+        return 0
     
     def _remove_aged_edges(self):
         """Remove edges with weight below threshold."""
         threshold = self.config.get('min_edge_weight', 0.1)
-        edges_to_remove = [
-            (u, v) for u, v, data in self.G.edges(data=True)
-            if data['weight'] < threshold
-        ]
-        
-        if edges_to_remove:
-            self.G.remove_edges_from(edges_to_remove)
-            self.components_dirty = True
\ No newline at end of file
+        # Freed slots hold +inf, so only live edges can fall below the threshold
+        slots = np.flatnonzero(self.edge_w_arr[:self._edge_slot_count] < threshold)
+        if not len(slots):
+            return
+        
+        endpoints = self._edge_endpoints[slots].tolist()
+        for slot, (u, v) in zip(slots.tolist(), endpoints):
+            self._invalidate_alias(u, v)
+            self._free_edge_slot(slot)
+        self.G.remove_edges_from(endpoints)
+        self._edges_removed += len(endpoints)
+        self.components_dirty = True
+        self._check_split(endpoints)
+        self._graph_version += 1
+        self.csr_dirty = True
\ No newline at end of file
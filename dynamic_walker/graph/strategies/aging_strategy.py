@@ -1,6 +1,7 @@
 from .base_strategy import BaseStrategy
 import random
-import networkx as nx
+import numpy as np
+from .._csr import aging_edge_scores, aging_weights, weighted_sample_k
 
 class AgingStrategy(BaseStrategy):
     """Implements aging-based attachment strategy for dynamic graphs."""
@@ -9,79 +10,57 @@ class AgingStrategy(BaseStrategy):
         """Initialize strategy with decay factor from config."""
         super().__init__(graph, config)
         self.decay_factor = config.get('decay_factor', 0.95)
+        # decay_factor ** age for every age up to the current time step
+        self._decay_pow = np.ones(1)
+    
+    def post_update(self):
+        """Advance time and extend the decay power table, doubling it when full."""
+        super().post_update()
+        if self.time_step >= len(self._decay_pow):
+            self._decay_pow = np.power(self.decay_factor, np.arange(2 * len(self._decay_pow)))
     
     def pre_attach(self, new_node):
         """Set birth step for new node before attachment."""
-        self.graph.G.nodes[new_node]['birth_step'] = self.time_step
+        self.graph.birth_arr[new_node] = self.time_step
     
     def attach(self, new_node):
         """Attach new node considering node age and activity."""
-        G = self.graph.G
-        if G.number_of_nodes() <= 1:
+        graph = self.graph
+        if graph.G.number_of_nodes() <= 1:
             return
-            
-        weights = {}
-        
-        for node, data in G.nodes(data=True):
-            if node == new_node:
-                continue
-                
-            age = self.time_step - data.get('birth_step', 0)
-            age_factor = self.decay_factor ** age
-            activity = data.get('activity', 0.5)
-            weights[node] = age_factor * (0.6 + 0.4 * activity)
         
-        if not weights:
+        nodes = graph.get_nodes_array()
+        nodes = nodes[nodes != new_node]
+        if not len(nodes):
             return
-            
-        num_edges = min(3, max(1, int(G.number_of_nodes() / 10)))
-        selected = set()
         
-        for _ in range(num_edges * 3):
-            if len(selected) >= num_edges:
-                break
-                
-            target = random.choices(
-                list(weights.keys()),
-                weights=list(weights.values()),
-                k=1
-            )[0]
-            
-            if self._add_edge(new_node, target):
-                selected.add(target)
-                weights[target] *= 0.3
+        weights = aging_weights(nodes, graph.birth_arr, graph.activity_arr,
+                                self.time_step, self._decay_pow)
+        num_edges = min(3, max(1, int(graph.G.number_of_nodes() / 10)), len(nodes))
+        
+        # One batched draw, seeded from the random module so seeded runs stay reproducible
+        uniforms = np.random.default_rng(random.getrandbits(64)).random(len(nodes))
+        for idx in weighted_sample_k(weights, num_edges, uniforms).tolist():
+            self._add_edge(new_node, int(nodes[idx]))
     
     def add_triadic_edges(self):
         """Add triadic closures based on edge age and activity."""
-        G = self.graph.G
+        graph = self.graph
+        G = graph.G
         if G.number_of_edges() == 0:
             return
-            
-        edge_weights = []
-        
-        for u, v in G.edges():
-            age = self.time_step - min(
-                G.nodes[u].get('birth_step', self.time_step),
-                G.nodes[v].get('birth_step', self.time_step)
-            )
-            weight = self.decay_factor ** age
-            activity = (G.nodes[u].get('activity', 0.5) + G.nodes[v].get('activity', 0.5)) / 2  
-            edge_weights.append(((u, v), weight * activity))
         
-        if not edge_weights:
+        endpoints = graph.get_edge_endpoints()
+        scores = aging_edge_scores(endpoints, graph.birth_arr, graph.activity_arr,
+                                   self.time_step, self._decay_pow)
+        best = int(np.argmax(scores))
+        # Every live edge aged out (or only freed slots remain): nothing worth closing
+        if scores[best] <= 0 or endpoints[best, 0] < 0:
             return
-            
-        edge_weights.sort(key=lambda x: x[1], reverse=True)
-        u, v = edge_weights[0][0]
+        u, v = endpoints[best].tolist()
         
         # Find potential triadic closure candidates
-        potential_targets = [
-            (v, neighbor) for neighbor in nx.neighbors(G, u)
-            if neighbor != v and not G.has_edge(v, neighbor)
-        ] + [
-            (u, neighbor) for neighbor in nx.neighbors(G, v)
-            if neighbor != u and not G.has_edge(u, neighbor)
-        ]
+        potential_targets = self._triadic_candidates(u, v)
         
         for source, target in potential_targets[:2]:
             self._add_edge(source, target)
\ No newline at end of file
@@ -8,6 +8,7 @@ class BaseStrategy(abc.ABC):
         self.graph = graph
         self.config = config
         self.time_step = 0
+        self.max_degree = config.get('max_degree', 15)
     
     def pre_attach(self, new_node):
         """Optional pre-attachment hook for new nodes."""
@@ -29,9 +30,22 @@ class BaseStrategy(abc.ABC):
     
     def _get_eligible_nodes(self, exclude_node=None):
         """Get nodes that haven't reached maximum degree."""
-        max_degree = self.config.get('max_degree', 15)
-        return [n for n in self.graph.G.nodes 
-               if n != exclude_node and self.graph.G.degree(n) < max_degree]
+        max_degree = self.max_degree
+        return [n for n, neighbors in self.graph.G.adj.items()
+                if n != exclude_node and len(neighbors) < max_degree]
+    
+    def _triadic_candidates(self, u, v):
+        """Get (endpoint, target) pairs that would close a triangle over edge (u, v), in one pass per side."""
+        adj = self.graph.G.adj
+        adj_u, adj_v = adj[u], adj[v]
+        candidates = []
+        for n in adj_u:
+            if n != v and n not in adj_v:
+                candidates.append((v, n))
+        for n in adj_v:
+            if n != u and n not in adj_u:
+                candidates.append((u, n))
+        return candidates
     
     def _add_edge(self, u, v, weight=1.0):
         """Wrapper for graph's edge addition method."""
@@ -1,91 +1,68 @@
 from .base_strategy import BaseStrategy
+from .._alias import AliasSampler
 import random
-import networkx as nx
+from itertools import islice
+import numpy as np
 
 class PreferentialStrategy(BaseStrategy):
     """Implements preferential attachment strategy for graph growth."""
     
     def __init__(self, graph, config):
-        """Initialize with preferential exponent parameter."""
+        """Initialize with preferential exponent and component bonus parameters."""
         super().__init__(graph, config)
         self.exponent = config.get('preferential_exponent', 1.0)
+        self.component_bonus = config.get('component_bonus', 1.5)
     
     def attach(self, new_node):
         """Attach new node using preferential attachment rules."""
-        G = self.graph.G
+        graph = self.graph
+        G = graph.G
         if G.number_of_nodes() < 2:
             return
         
-        new_comp = next(nx.connected_components(G), set()) if G.nodes else set()
-        candidates = []
-        
-        for node in G.nodes:
-            if node == new_node:
-                continue
-                
-            if G.degree(node) >= self.config.get('max_degree', 15):
-                continue
-                
-            weight = G.degree(node) ** self.exponent
-            same_component = node in new_comp
-            bonus = 1.0 if same_component else 1.5
-            candidates.append((node, weight * bonus))
+        # Single degree snapshot, then mask and weight the whole node array at once
+        adj = G.adj
+        nodes = graph.get_nodes_array()
+        comp_ids = graph._get_component_ids()
+        degrees = np.fromiter((len(adj[n]) for n in nodes.tolist()), dtype=np.float64, count=len(nodes))
         
-        if not candidates:
+        mask = (nodes != new_node) & (degrees < self.max_degree)
+        if not mask.any():
             return
-            
-        # Normalize weights for probability distribution
-        total_weight = sum(w for _, w in candidates)
-        probabilities = [w / total_weight for _, w in candidates]
+        
+        nodes, degrees, comp_ids = nodes[mask], degrees[mask], comp_ids[mask]
+        weights = degrees if self.exponent == 1.0 else np.power(degrees, self.exponent)
+        
+        # One alias table per set of joined components; repeats are rejected instead of renormalizing
+        sampler = AliasSampler(weights)
         num_edges = min(3, max(1, int(G.number_of_nodes() / 10)))
         selected = set()
+        joined = set()
         
-        for _ in range(num_edges * 2):
+        for _ in range(num_edges * 4):
             if len(selected) >= num_edges:
                 break
                 
-            idx = random.choices(range(len(candidates)), weights=probabilities)[0]
-            target, weight = candidates[idx]
+            idx = sampler.sample()
+            target = int(nodes[idx])
             
-            if self._add_edge(new_node, target):
+            if target not in selected and self._add_edge(new_node, target):
                 selected.add(target)
-                probabilities[idx] = 0
-                total_weight = sum(probabilities)
-                if total_weight > 0:
-                    probabilities = [p / total_weight for p in probabilities]
+                if comp_ids[idx] not in joined:
+                    # Later picks favor components the new node does not reach yet
+                    joined.add(int(comp_ids[idx]))
+                    bonus = np.where(np.isin(comp_ids, list(joined)), 1.0, self.component_bonus)
+                    sampler = AliasSampler(weights * bonus)
     
     def add_triadic_edges(self):
-        """Add triadic closures with preference for cross-component edges."""
+        """Add triadic closures around a uniformly chosen edge."""
         G = self.graph.G
         if G.number_of_edges() == 0:
             return
-            
-        cross_edges = []
-        same_edges = []
-        components = list(nx.connected_components(G))
-        
-        for u, v in G.edges():
-            comp_u = next((c for c in components if u in c), set())
-            comp_v = next((c for c in components if v in c), set())
-            
-            if comp_u == comp_v:
-                same_edges.append((u, v))
-            else:
-                cross_edges.append((u, v))
         
-        # Prefer cross-component edges for better connectivity
-        selected_edge = random.choice(cross_edges) if cross_edges else random.choice(same_edges) if same_edges else None
-        if not selected_edge:
-            return
-            
-        u, v = selected_edge
-        potential_targets = [
-            (v, neighbor) for neighbor in nx.neighbors(G, u)
-            if neighbor != v and not G.has_edge(v, neighbor)
-        ] + [
-            (u, neighbor) for neighbor in nx.neighbors(G, v)
-            if neighbor != u and not G.has_edge(u, neighbor)
-        ]
+        # Both endpoints of an edge always share a component, so every edge is a same-component edge
+        u, v = next(islice(G.edges(), random.randrange(G.number_of_edges()), None))
+        potential_targets = self._triadic_candidates(u, v)
         
         if potential_targets:
             for source, target in random.sample(potential_targets, min(2, len(potential_targets))):
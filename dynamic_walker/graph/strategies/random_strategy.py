@@ -1,6 +1,6 @@
 from .base_strategy import BaseStrategy
 import random
-import networkx as nx
+from itertools import islice
 
 class RandomStrategy(BaseStrategy):
     """Implements random attachment strategy for graph growth."""
@@ -11,8 +11,7 @@ class RandomStrategy(BaseStrategy):
         if G.number_of_nodes() <= 1:
             return
         
-        candidates = [n for n in G.nodes if n != new_node and 
-                     G.degree(n) < self.config.get('max_degree', 15)]
+        candidates = self._get_eligible_nodes(new_node)
         
         if not candidates:
             return
@@ -29,14 +28,9 @@ class RandomStrategy(BaseStrategy):
             return
             
         # Select random edge and potential triangle completions
-        u, v = random.choice(list(G.edges()))
-        potential_targets = [
-            (v, n) for n in nx.neighbors(G, u) 
-            if n != v and not G.has_edge(v, n)
-        ] + [
-            (u, n) for n in nx.neighbors(G, v)
-            if n != u and not G.has_edge(u, n)
-        ]
+        # Skip to a random edge instead of materializing the edge list
+        u, v = next(islice(G.edges(), random.randrange(G.number_of_edges()), None))
+        potential_targets = self._triadic_candidates(u, v)
         
         # Add 1-2 random triangle edges
         for source, target in random.sample(potential_targets, min(2, len(potential_targets))):
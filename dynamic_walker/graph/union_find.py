@@ -0,0 +1,41 @@
+class UnionFind:
+    """Disjoint-set forest over integer node ids with path halving, union by size and a set count."""
+    
+    def __init__(self, size=0):
+        """Create size singleton sets for ids 0..size-1."""
+        self.parent = list(range(size))
+        self.size = [1] * size
+        self.count = size
+    
+    def add(self, node):
+        """Make sure ids up to node exist, new ids start as singletons."""
+        start = len(self.parent)
+        if node >= start:
+            self.parent.extend(range(start, node + 1))
+            self.size.extend([1] * (node + 1 - start))
+            self.count += node + 1 - start
+    
+    def find(self, node):
+        """Return the representative of node's set."""
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+    
+    def union(self, a, b):
+        """Merge the sets of a and b, returning False if they were already joined."""
+        self.add(max(a, b))
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        self.count -= 1
+        return True
+    
+    def connected(self, a, b):
+        """Check whether a and b are in the same set."""
+        return self.find(a) == self.find(b)
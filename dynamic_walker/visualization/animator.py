@@ -1,8 +1,8 @@
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
-import random
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
 from matplotlib.colors import LinearSegmentedColormap
 import matplotlib as mpl
 
@@ -10,15 +10,17 @@ import matplotlib as mpl
 class GraphAnimator:
     """Visualizes dynamic graph evolution with random walker animation."""
     
-    def __init__(self, dynamic_graph, walker, steps=500, interval=200, **params):
+    def __init__(self, dynamic_graph, walker, steps=500, interval=200, seed=None, **params):
         """
         Initialize the animator with graph and walker.
+        seed drives this animator's own generator for frame decisions and placement noise.
         """
         self.dynamic_graph = dynamic_graph
         self.walker = walker
         self.steps = steps
         self.interval = interval
         self.params = params
+        self._rng = np.random.default_rng(seed)
         
         # Initialize figure and visual settings
         self.fig, self.ax = plt.subplots(figsize=(12, 8), facecolor='#f0f0f0')
@@ -42,171 +44,331 @@ class GraphAnimator:
         # Styling
         plt.style.use('seaborn-v0_8-pastel')
         self.ax.set_facecolor('#fafafa')
+        self.ax.set_axis_off()
+        
+        self._create_artists()
+    
+    def _create_artists(self):
+        """Create the persistent artists that every frame updates in place."""
+        empty = np.empty((0, 2))
+        
+        self._glow = self.ax.scatter(empty[:, 0], empty[:, 1], s=1000, alpha=0.15, color='#e7298a', zorder=-1)
+        
+        self._edge_coll = LineCollection([], colors='#888888', linestyles='solid', linewidths=0.8, alpha=0.3, zorder=1)
+        self.ax.add_collection(self._edge_coll)
+        
+        self._node_coll = self.ax.scatter(
+            empty[:, 0], empty[:, 1],
+            c=np.empty(0),
+            cmap=self.node_cmap,
+            alpha=0.85,
+            edgecolors='#555555',
+            linewidths=0.8,
+            zorder=2
+        )
+        
+        self._highlight = self.ax.scatter(
+            empty[:, 0], empty[:, 1],
+            s=300,
+            color='#e7298a',
+            edgecolors='#ff00ff',
+            linewidths=2.0,
+            zorder=3
+        )
+        
+        self._info_text = self.ax.text(
+            0.98, 0.02, "",
+            transform=self.ax.transAxes,
+            fontsize=11,
+            fontfamily='monospace',
+            verticalalignment='bottom',
+            horizontalalignment='right',
+            bbox=dict(
+                boxstyle='round,pad=0.5',
+                facecolor='white',
+                edgecolor='#dddddd',
+                alpha=0.8
+            ),
+            zorder=4
+        )
+        
+        self._artists = (self._glow, self._edge_coll, self._node_coll, self._highlight, self._info_text)
     
     def _initialize_positions(self):
         """Initialize node positions using spring layout."""
         G = self.dynamic_graph.G
-        self.prev_pos = nx.spring_layout(G, seed=42)
-        self.current_pos = self.prev_pos.copy()
+        layout = nx.spring_layout(G, seed=42)
+        
+        # Positions are (N, 2) arrays; _node_index maps node -> row and _row_nodes row -> node
+        self._row_nodes = list(layout)
+        self._node_index = {node: i for i, node in enumerate(self._row_nodes)}
+        self._pos = np.array(list(layout.values()), dtype=np.float64).reshape(-1, 2)
+        self._prev_pos = self._pos.copy()
+        
+        # A full layout pass reruns when the node count drifts by 10%,
+        # or when the topology has changed since the last pass and 25 frames have gone by
+        self._layout_size = G.number_of_nodes()
+        self._layout_frame = 0
+        self._layout_version = self.dynamic_graph._graph_version
     
-    def _update_positions(self, G, frame):
-        """Update node positions with smooth interpolation."""
-        # Calculate new positions using current as base
-        new_pos = nx.spring_layout(
-            G,
-            pos=self.current_pos.copy(),
-            seed=42,
-            iterations=15 if frame == 0 else 8
+    def _add_rows(self, nodes, coords):
+        """Append rows for new nodes to both position arrays."""
+        start = len(self._row_nodes)
+        self._row_nodes.extend(nodes)
+        self._node_index.update((node, start + i) for i, node in enumerate(nodes))
+        self._pos = np.vstack((self._pos, coords))
+        self._prev_pos = np.vstack((self._prev_pos, coords))
+    
+    def _remove_rows(self, nodes):
+        """Drop rows of removed nodes, moving the last row into each hole."""
+        for node in nodes:
+            row = self._node_index.pop(node)
+            last = len(self._row_nodes) - 1
+            if row != last:
+                moved = self._row_nodes[last]
+                self._row_nodes[row] = moved
+                self._node_index[moved] = row
+                self._pos[row] = self._pos[last]
+                self._prev_pos[row] = self._prev_pos[last]
+            self._row_nodes.pop()
+        
+        size = len(self._row_nodes)
+        self._pos = self._pos[:size]
+        self._prev_pos = self._prev_pos[:size]
+    
+    def _update_positions(self, G, frame, nodes_changed=True, moved_nodes=()):
+        """
+        Update node positions with smooth interpolation, returning an (N, 2) array in row order.
+        moved_nodes are existing nodes whose edges changed; between full passes only they are re-settled.
+        """
+        if nodes_changed or len(self._row_nodes) != G.number_of_nodes():
+            index = self._node_index
+            self._remove_rows([node for node in self._row_nodes if node not in G])
+            new_nodes = [node for node in G if node not in index]
+            if new_nodes:
+                self._add_rows(new_nodes, self._place_new_nodes(G, new_nodes))
+        
+        n = len(self._row_nodes)
+        version = self.dynamic_graph._graph_version
+        full_layout = (
+            abs(n - self._layout_size) > 0.1 * self._layout_size
+            or (version != self._layout_version and frame - self._layout_frame >= 25)
         )
         
-        # Interpolate positions
-        interpolated_pos = {}
+        new_pos = self._pos
+        if full_layout:
+            # Full spring pass warm-started from the current layout
+            # (networkx switches to its sparse solver for large graphs when scipy is installed)
+            layout = nx.spring_layout(G, pos=dict(zip(self._row_nodes, self._pos)) or None, seed=42, iterations=15)
+            new_pos = np.array([layout[node] for node in self._row_nodes], dtype=np.float64).reshape(-1, 2)
+            self._layout_size = n
+            self._layout_frame = frame
+            self._layout_version = version
+        elif moved_nodes:
+            new_pos = self._relax_nodes(G, moved_nodes)
+        
+        # Interpolate positions; new rows start with prev == current, so they appear in place
         alpha = min(1.0, 0.1 + frame * 0.05)
+        interpolated = alpha * new_pos + (1 - alpha) * self._prev_pos
         
-        for node in G.nodes():
-            if node in self.prev_pos and node in new_pos:
-                # Smooth transition for existing nodes
-                interpolated_pos[node] = (
-                    alpha * new_pos[node][0] + (1 - alpha) * self.prev_pos[node][0],
-                    alpha * new_pos[node][1] + (1 - alpha) * self.prev_pos[node][1]
-                )
-            else:
-                # Use direct position for new nodes
-                interpolated_pos[node] = new_pos[node]
-        
-        self.prev_pos = self.current_pos.copy()
-        self.current_pos = new_pos.copy()
-        
-        return interpolated_pos
+        self._prev_pos = self._pos
+        self._pos = new_pos.copy()
+        
+        return interpolated
 
-    def _calculate_node_sizes(self, G):
-        """Calculate node sizes based on their degree."""
-        degrees = np.array([d for _, d in G.degree()])
-        min_size, max_size = 50, 300
+    def _place_new_nodes(self, G, new_nodes):
+        """Lay out new nodes around their neighbors with every existing node pinned, returning their rows."""
+        adj = G.adj
+        index = self._node_index
+        positions = self._pos
+        if len(positions):
+            low, high = positions.min(axis=0), positions.max(axis=0)
+        else:
+            low, high = np.full(2, -1.0), np.full(2, 1.0)
         
-        if degrees.max() == degrees.min():
-            return np.full(len(degrees), (min_size + max_size) / 2)
+        new_set = set(new_nodes)
+        region = set(new_set)
+        pos = {}
+        # One batch of noise and fallback positions for all new nodes
+        jitter = self._rng.normal(0, 0.02, (len(new_nodes), 2))
+        fallback = self._rng.uniform(low, high, (len(new_nodes), 2))
+        for i, node in enumerate(new_nodes):
+            anchors = [index[n] for n in adj[node] if n in index]
+            region.update(adj[node])
+            # Start at the neighbors' centroid, or anywhere in the current extent
+            start = positions[anchors].mean(axis=0) if anchors else fallback[i]
+            pos[node] = start + jitter[i]
         
-        return min_size + (max_size - min_size) * (degrees - degrees.min()) / (degrees.max() - degrees.min())
+        # Spring forces only act on the new nodes' neighborhood
+        fixed = [node for node in region if node not in new_set]
+        if fixed:
+            pos.update((node, positions[index[node]]) for node in fixed)
+            pos = nx.spring_layout(
+                G.subgraph(region),
+                pos=pos,
+                fixed=fixed,
+                seed=42,
+                iterations=5
+            )
+        
+        return np.array([pos[node] for node in new_nodes], dtype=np.float64).reshape(-1, 2)
 
-    def _draw_graph(self, G, pos):
-        """Draw the graph with current parameters."""
-        # Ensure all nodes have positions
-        for node in G.nodes():
-            if node not in pos:
-                pos[node] = (random.random(), random.random())
-        
-        node_sizes = self._calculate_node_sizes(G)
-        degrees = np.array([d for _, d in G.degree()])
-        
-        # Draw nodes
-        nx.draw_networkx_nodes(
-            G, pos, ax=self.ax, 
-            node_size=node_sizes,
-            node_color=degrees,
-            cmap=self.node_cmap,
-            alpha=0.85,
-            edgecolors='#555555',
-            linewidths=0.8
+    def _relax_nodes(self, G, nodes):
+        """Re-settle the given nodes against their pinned neighbors, returning a new position array."""
+        index = self._node_index
+        positions = self._pos
+        new_pos = positions.copy()
+        moving = [node for node in nodes if node in index]
+        region = set(moving)
+        for node in moving:
+            region.update(G.adj[node])
+        fixed = [node for node in region if node not in nodes]
+        if not moving or not fixed:
+            return new_pos
+        
+        layout = nx.spring_layout(
+            G.subgraph(region),
+            pos={node: positions[index[node]] for node in region},
+            fixed=fixed,
+            seed=42,
+            iterations=5
         )
+        new_pos[[index[node] for node in moving]] = [layout[node] for node in moving]
+        return new_pos
+
+    def _frame_record(self, G, pos, frame):
+        """Build the artist state for the graph at an (N, 2) position array in row order."""
+        index = self._node_index
+        adj = G.adj
+        
+        # One degree pass feeds node sizes, colors and the info panel
+        degrees = np.fromiter((len(adj[node]) for node in self._row_nodes), dtype=np.int64, count=len(self._row_nodes))
         
-        # Draw edges
-        nx.draw_networkx_edges(
-            G, pos, ax=self.ax, 
-            edge_color='#888888',
-            style="solid",
-            width=0.8,
-            alpha=0.3,
+        min_size, max_size = 50, 300
+        node_sizes = np.full(len(degrees), (min_size + max_size) / 2)
+        clim = None
+        if len(degrees):
+            dmin, dmax = degrees.min(), degrees.max()
+            clim = (dmin, dmax)
+            if dmax != dmin:
+                node_sizes = min_size + (degrees - dmin) * ((max_size - min_size) / (dmax - dmin))
+        
+        # Edges
+        edge_rows = np.fromiter(
+            (index[node] for edge in G.edges() for node in edge),
+            dtype=np.int64, count=2 * G.number_of_edges()
         )
+        segments = pos[edge_rows].reshape(-1, 2, 2)
         
         # Highlight current node
         current_node = self.walker.current_node
-        if current_node in G.nodes:
-            self._highlight_node(current_node, pos)
-
-    def _highlight_node(self, node, pos):
-        """Highlight the specified node with special styling."""
-        nx.draw_networkx_nodes(
-            self.dynamic_graph.G, pos, 
-            nodelist=[node],
-            node_size=300,
-            node_color='#e7298a',
-            edgecolors='#ff00ff',
-            linewidths=2.0,
-            ax=self.ax
-        )
+        if current_node in index:
+            highlight = pos[index[current_node]].reshape(1, 2)
+        else:
+            highlight = np.empty((0, 2))
         
-        # Add glow effect
-        self.ax.scatter(
-            [pos[node][0]],
-            [pos[node][1]],
-            s=1000,
-            alpha=0.15,
-            color='#e7298a',
-            zorder=-1
-        )
+        return (pos, node_sizes, degrees, clim, segments, highlight,
+                self._view_limits(pos), self._info_panel_text(G, frame, degrees))
 
-    def _render_info_panel(self, frame):
-        """Render information panel with current stats including graph density."""
-        G = self.dynamic_graph.G
+    def _view_limits(self, offsets):
+        """Get (xlim, ylim) around the node positions with a small margin, or None without nodes."""
+        if not len(offsets):
+            return None
+        low, high = offsets.min(axis=0), offsets.max(axis=0)
+        margin = np.maximum((high - low) * 0.05, 0.05)
+        return (low[0] - margin[0], high[0] + margin[0]), (low[1] - margin[1], high[1] + margin[1])
+
+    def _info_panel_text(self, G, frame, degrees):
+        """Build the information panel text with current stats including graph density."""
         n = G.number_of_nodes()
-        m = G.number_of_edges()
+        # Reuse this frame's degree vector (handshake lemma) instead of recounting edges
+        m = int(degrees.sum()) // 2 if len(degrees) == n else G.number_of_edges()
         
         # Calculate density (handle cases when n < 2)
         density = (2 * m) / (n * (n - 1)) if n > 1 else 0.0
         
-        info = (
+        return (
             f"Step: {frame}/{self.steps}\n"
             f"Nodes: {n}\n"
             f"Edges: {m}\n"
             f"Density: {density:.4f}\n"
-            f"Components: {nx.number_connected_components(G)}\n"
+            f"Components: {self.dynamic_graph.number_connected_components()}\n"
             f"Current node: {self.walker.current_node}"
         )
         
-        self.ax.text(
-            0.98, 0.02, info,
-            transform=self.ax.transAxes,
-            fontsize=11,
-            fontfamily='monospace',
-            verticalalignment='bottom',
-            horizontalalignment='right',
-            bbox=dict(
-                boxstyle='round,pad=0.5',
-                facecolor='white',
-                edgecolor='#dddddd',
-                alpha=0.8
-            )
-        )
-        
-    def _update_frame(self, frame):
-        """Update function for animation frames."""
-        self.ax.clear()
-        self.ax.set_facecolor('#fafafa')
-        
+    def _compute_frame(self, frame):
+        """Advance the simulation to frame and return its artist state, without touching any artist."""
         # Update system state
+        nodes_changed = frame == 0
+        moved_nodes = set()
         if frame > 0:
-            self.dynamic_graph.update(self.params)
-            self.walker.step()
+            # One batched draw covers the frame's evolution and walk decisions
+            u = self._rng.random(7)
+            nodes_added, nodes_removed, _, _ = self.dynamic_graph.update(self.params, u[:4])
+            nodes_changed = bool(nodes_added or nodes_removed)
+            # Endpoints of new edges are re-settled; brand-new nodes were already placed
+            moved_nodes = {node for edge in self.dynamic_graph.last_added_edges for node in edge}
+            moved_nodes.difference_update(self.dynamic_graph.last_added_nodes)
+            # Advance through the compiled walk kernel when numba is available
+            self.walker.run(1, u[4:].reshape(3, 1))
         
         G = self.dynamic_graph.G
-        pos = self._update_positions(G, frame)
-        
-        # Draw elements
-        self._draw_graph(G, pos)
-        self._render_info_panel(frame)
-        
-        self.ax.set_axis_off()
+        pos = self._update_positions(G, frame, nodes_changed, moved_nodes)
+        return self._frame_record(G, pos, frame)
+
+    def _update_frame(self, frame):
+        """Update function for animation frames."""
+        return self._play_frame(self._compute_frame(frame))
+
+    def _play_frame(self, record):
+        """Apply one frame's state to the persistent artists in place."""
+        offsets, sizes, degrees, clim, segments, highlight, limits, info = record
+        self._node_coll.set_offsets(offsets)
+        self._node_coll.set_sizes(sizes)
+        self._node_coll.set_array(degrees)
+        if clim is not None:
+            self._node_coll.set_clim(*clim)
+        self._edge_coll.set_segments(segments)
+        self._highlight.set_offsets(highlight)
+        self._glow.set_offsets(highlight)
+        if limits is not None:
+            self.ax.set_xlim(limits[0])
+            self.ax.set_ylim(limits[1])
+        self._info_text.set_text(info)
+        return self._artists
+
+    def precompute(self):
+        """Run the whole simulation headless, returning one record per frame for play()."""
+        return [self._compute_frame(frame) for frame in range(self.steps + 1)]
+
+    def _init_frame(self):
+        """Initial blit frame: the static background without graph artists."""
+        return self._artists
 
     def animate(self):
         """Start the animation process."""
         self.animation = FuncAnimation(
             self.fig,
             self._update_frame,
+            init_func=self._init_frame,
             frames=self.steps + 1,
             interval=self.interval,
             repeat=False,
-            blit=False
+            blit=True
+        )
+        plt.show()
+        return self.animation
+
+    def play(self, frames):
+        """Animate frames recorded by precompute(), so playback never waits on the simulation."""
+        self.animation = FuncAnimation(
+            self.fig,
+            self._play_frame,
+            init_func=self._init_frame,
+            frames=frames,
+            interval=self.interval,
+            repeat=False,
+            blit=True
         )
         plt.show()
         return self.animation
\ No newline at end of file
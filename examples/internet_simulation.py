@@ -49,4 +49,4 @@ evolution_params = {
 
 # Visualization with 800 steps at 50ms intervals
 animator = GraphAnimator(internet_graph, walker, steps=800, interval=50, **evolution_params)
-animator.animate()
\ No newline at end of file
+animator.play(animator.precompute())
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Run every example simulation at once, each in its own process,
+so the simulations and their figure windows don't compete for one core.
+"""
+
+import multiprocessing as mp
+import runpy
+from pathlib import Path
+
+EXAMPLES_DIR = Path(__file__).resolve().parent
+
+# Independent simulations, each with its own Matplotlib figure
+examples = [
+    "social_network_simulation.py",
+    "stochastic_network_simulation.py",
+    "internet_simulation.py",
+]
+
+if __name__ == "__main__":
+    processes = [
+        mp.Process(target=runpy.run_path, args=(str(EXAMPLES_DIR / name),), kwargs={"run_name": "__main__"})
+        for name in examples
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
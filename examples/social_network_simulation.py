@@ -49,4 +49,4 @@ social_evolution = {
 
 # Visualization with 800 steps at 50ms intervals
 animator = GraphAnimator(social_graph, social_walker,steps=800,interval=50,**social_evolution)
-animator.animate()
+animator.play(animator.precompute())
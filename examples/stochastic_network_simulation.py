@@ -50,4 +50,4 @@ evolution_params = {
 
 # Visualization with 800 steps at 50ms intervals
 animator = GraphAnimator(stochastic_net, navigator, steps=800, interval=50, **evolution_params)
-animator.animate()
\ No newline at end of file
+animator.play(animator.precompute())
\ No newline at end of file
@@ -0,0 +1,63 @@
+import random
+import unittest
+
+import numpy as np
+
+from dynamic_walker.graph._csr import weighted_sample_k
+from dynamic_walker.graph.dynamic_graph import DynamicGraph
+
+
+class TestWeightedSampleK(unittest.TestCase):
+    def test_skips_non_positive_weights(self):
+        weights = np.array([0.0, 0.0, 1.0, 0.0, 2.0])
+        for seed in range(20):
+            uniforms = np.random.default_rng(seed).random(len(weights))
+            picked = weighted_sample_k(weights, 3, uniforms)
+            self.assertEqual(sorted(picked.tolist()), [2, 4])
+    
+    def test_all_zero_weights_pick_nothing(self):
+        picked = weighted_sample_k(np.zeros(4), 2, np.full(4, 0.5))
+        self.assertEqual(len(picked), 0)
+    
+    def test_distinct_picks(self):
+        weights = np.linspace(0.1, 1.0, 50)
+        picked = weighted_sample_k(weights, 3, np.random.default_rng(0).random(50))
+        self.assertEqual(len(set(picked.tolist())), 3)
+
+
+class TestAgingAttach(unittest.TestCase):
+    def test_aged_out_nodes_get_no_edges(self):
+        random.seed(0)
+        graph = DynamicGraph("aging", initial_nodes=40, target_components=1)
+        strategy = graph.strategy
+        keep = int(graph.get_nodes_array()[0])
+        
+        # Every node but `keep` has an age whose decay factor underflowed to zero
+        strategy._decay_pow = np.zeros(len(strategy._decay_pow) + 2)
+        strategy._decay_pow[0] = 1.0
+        graph.birth_arr[:graph.node_counter] = strategy.time_step - 1
+        graph.birth_arr[keep] = strategy.time_step
+        
+        new_node = graph._add_node()
+        self.assertEqual(list(graph.G.adj[new_node]), [keep])
+
+
+class TestAgingTriadic(unittest.TestCase):
+    def test_triadic_skips_when_every_edge_aged_out(self):
+        random.seed(0)
+        graph = DynamicGraph("aging", initial_nodes=40, target_components=1)
+        strategy = graph.strategy
+        # Free some slots so argmax has freed entries to land on
+        for u, v in list(graph.G.edges())[:5]:
+            graph._remove_edge(u, v)
+        
+        strategy._decay_pow = np.zeros(len(strategy._decay_pow) + 2)
+        graph.birth_arr[:graph.node_counter] = strategy.time_step - 1
+        edges_before = graph.G.number_of_edges()
+        
+        strategy.add_triadic_edges()
+        self.assertEqual(graph.G.number_of_edges(), edges_before)
+
+
+if __name__ == "__main__":
+    unittest.main()
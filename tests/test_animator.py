@@ -0,0 +1,52 @@
+import copy
+import random
+import unittest
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from dynamic_walker.graph.biased_walker import BiasedRandomWalker
+from dynamic_walker.graph.dynamic_graph import DynamicGraph
+from dynamic_walker.visualization.animator import GraphAnimator
+
+PARAMS = {"node_add_prob": 0.3, "node_remove_prob": 0.1, "triadic_prob": 0.5}
+
+
+def _animator(graph, seed):
+    """Build an animator on a private copy of graph with a fixed walker seed."""
+    graph = copy.deepcopy(graph)
+    animator = GraphAnimator(graph, BiasedRandomWalker(graph, seed=1), steps=20, seed=seed, **PARAMS)
+    plt.close(animator.fig)
+    return animator
+
+
+def _positions(graph, seed):
+    """Precompute a short run and return every frame's position array."""
+    animator = _animator(graph, seed)
+    random.seed(0)
+    return [record[0] for record in animator.precompute()]
+
+
+class TestAnimatorSeed(unittest.TestCase):
+    def setUp(self):
+        random.seed(2)
+        self.graph = DynamicGraph("random", initial_nodes=30, target_components=2)
+    
+    def test_same_seed_replays_the_same_run(self):
+        for first, second in zip(_positions(self.graph, 7), _positions(self.graph, 7)):
+            np.testing.assert_array_equal(first, second)
+    
+    def test_animators_own_their_generators(self):
+        first, second = _animator(self.graph, 7), _animator(self.graph, 7)
+        self.assertIsNot(first._rng, second._rng)
+        first._rng.random(100)
+        # Drawing from one animator leaves the other's stream untouched
+        self.assertEqual(second._rng.random(), np.random.default_rng(7).random())
+
+
+if __name__ == "__main__":
+    unittest.main()
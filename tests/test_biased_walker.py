@@ -0,0 +1,89 @@
+import copy
+import random
+import unittest
+
+import numpy as np
+
+import dynamic_walker.graph.biased_walker as biased_walker
+from dynamic_walker.graph._walk_kernel import _row_cdf, _weighted_pick
+from dynamic_walker.graph.biased_walker import BiasedRandomWalker
+from dynamic_walker.graph.dynamic_graph import DynamicGraph
+
+
+def _evolved_graph():
+    """Build a multi-component graph with some evolution history."""
+    random.seed(3)
+    graph = DynamicGraph("random", initial_nodes=80, target_components=3)
+    for _ in range(50):
+        graph.update({})
+    return graph
+
+
+def _path(graph, use_kernel, **walker_params):
+    """Walk 300 steps from a fixed seed through the kernel or the Python step."""
+    original = biased_walker.NUMBA_AVAILABLE
+    biased_walker.NUMBA_AVAILABLE = use_kernel
+    try:
+        random.seed(0)
+        walker = BiasedRandomWalker(graph, seed=5, **walker_params)
+        walker.run(300)
+        return list(walker.path)
+    finally:
+        biased_walker.NUMBA_AVAILABLE = original
+
+
+def _animated_path(graph, use_run, steps=150):
+    """Evolve a private copy of graph and walk one step per frame, as the animator does."""
+    graph = copy.deepcopy(graph)
+    walker = BiasedRandomWalker(graph, seed=5, adaptive_bias=True, teleport_strategy="component",
+                                teleport_probability=0.2)
+    random.seed(1)
+    for _ in range(steps):
+        graph.update({"node_add_prob": 0.2, "node_remove_prob": 0.1, "edge_remove_prob": 0.2})
+        if use_run:
+            walker.run(1, np.array([[random.random()] for _ in range(3)]))
+        else:
+            walker.step()
+    return list(walker.path)
+
+
+class TestKernelParity(unittest.TestCase):
+    def test_run_one_step_matches_step_during_evolution(self):
+        graph = _evolved_graph()
+        original = biased_walker.NUMBA_AVAILABLE
+        biased_walker.NUMBA_AVAILABLE = True
+        try:
+            self.assertEqual(_animated_path(graph, True), _animated_path(graph, False))
+        finally:
+            biased_walker.NUMBA_AVAILABLE = original
+    
+    def test_adaptive_paths_match_python_step(self):
+        graph = _evolved_graph()
+        cases = [("component", 0), ("distant", 0), ("uniform", 0), ("uniform", 2)]
+        for strategy, distance in cases:
+            params = dict(adaptive_bias=True, teleport_strategy=strategy,
+                          max_teleport_distance=distance, teleport_probability=0.3)
+            with self.subTest(strategy=strategy, distance=distance):
+                self.assertEqual(_path(graph, True, **params), _path(graph, False, **params))
+
+    def test_non_adaptive_neighbor_distributions_match(self):
+        graph = _evolved_graph()
+        walker = BiasedRandomWalker(graph, bias_type="weight", adaptive_bias=False, exploration_factor=1.3)
+        indptr, indices, edge_w = graph.get_csr()
+        bias = walker._get_bias_vector(indptr, edge_w)
+        row_cdf = _row_cdf(indptr, indices, bias, walker.min_weight, walker.exploration_factor)
+        grid = (np.arange(20000) + 0.5) / 20000
+        
+        for row in np.flatnonzero(np.diff(indptr) > 1)[:10].tolist():
+            begin, end = indptr[row], indptr[row + 1]
+            node = int(graph.index_node[row])
+            rows = indices[begin:end]
+            alias = np.bincount([walker._sample_alias(node, rows, indptr, edge_w, u) for u in grid],
+                                minlength=end - begin)
+            kernel = np.bincount([_weighted_pick(row_cdf[begin:end], end - begin, u) for u in grid],
+                                 minlength=end - begin)
+            np.testing.assert_allclose(alias / len(grid), kernel / len(grid), atol=1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import copy
+import pickle
+import random
+import unittest
+
+import networkx as nx
+import numpy as np
+
+import dynamic_walker.graph.dynamic_graph as dynamic_graph
+from dynamic_walker.graph.dynamic_graph import DynamicGraph
+
+
+def _evolved_graph(strategy="random", steps=50, **config):
+    """Build a small graph and run a few evolution steps."""
+    random.seed(0)
+    graph = DynamicGraph(strategy, initial_nodes=30, target_components=2, **config)
+    for _ in range(steps):
+        graph.update({"node_add_prob": 0.1, "edge_remove_prob": 0.2, "triadic_prob": 0.5})
+    return graph
+
+
+class TestSnapshots(unittest.TestCase):
+    def test_deepcopy_round_trip(self):
+        graph = _evolved_graph()
+        graph.get_teleport_candidates(next(iter(graph.G)), cutoff=2)
+        clone = copy.deepcopy(graph)
+        
+        self.assertTrue(nx.utils.graphs_equal(graph.G, clone.G))
+        self.assertIsNot(clone._teleport_lock, graph._teleport_lock)
+        # The copy keeps evolving independently of the original
+        clone.update({"node_add_prob": 1.0})
+        self.assertEqual(clone.G.number_of_nodes(), graph.G.number_of_nodes() + 1)
+    
+    def test_pickle_round_trip(self):
+        graph = _evolved_graph()
+        clone = pickle.loads(pickle.dumps(graph))
+        self.assertTrue(nx.utils.graphs_equal(graph.G, clone.G))
+        self.assertEqual(clone.number_connected_components(), nx.number_connected_components(clone.G))
+
+
+
+class TestEdgeSlots(unittest.TestCase):
+    def test_removed_edge_slot_is_reused(self):
+        graph = _evolved_graph()
+        u, v = next(iter(graph.G.edges()))
+        slot = graph.G.adj[u][v]['slot']
+        slot_count = graph._edge_slot_count
+        graph._remove_edge(u, v)
+        self.assertEqual(graph.get_edge_endpoints()[slot].tolist(), [-1, -1])
+        
+        a, b = next((a, b) for a in graph.G for b in graph.G
+                    if a < b and not graph.G.has_edge(a, b) and (a, b) != (min(u, v), max(u, v)))
+        self.assertTrue(graph._add_edge(a, b, weight=0.5))
+        self.assertEqual(graph.G.adj[a][b]['slot'], slot)
+        self.assertEqual(graph._edge_slot_count, slot_count)
+        self.assertEqual(graph.get_edge_endpoints()[slot].tolist(), [a, b])
+        self.assertEqual(graph.edge_weight(a, b), 0.5)
+    
+    def test_live_slots_match_graph_edges(self):
+        graph = _evolved_graph(steps=100)
+        endpoints = graph.get_edge_endpoints()
+        live = {tuple(sorted(pair)) for pair in endpoints.tolist() if pair[0] >= 0}
+        self.assertEqual(live, {tuple(sorted(edge)) for edge in graph.G.edges()})
+        for u, v, data in graph.G.edges(data=True):
+            self.assertEqual(sorted(endpoints[data['slot']].tolist()), sorted((u, v)))
+        graph.sync_attributes()
+        for u, v, weight in graph.G.edges(data='weight'):
+            self.assertEqual(weight, graph.edge_weight(u, v))
+
+
+class TestAging(unittest.TestCase):
+    def test_numpy_fallback_matches_kernel(self):
+        graphs = [_evolved_graph(steps=10) for _ in range(2)]
+        original = dynamic_graph.NUMBA_AVAILABLE
+        try:
+            for numba_available, graph in zip((True, False), graphs):
+                dynamic_graph.NUMBA_AVAILABLE = numba_available
+                for _ in range(30):
+                    graph.update_activity()
+        finally:
+            dynamic_graph.NUMBA_AVAILABLE = original
+        
+        kernel, fallback = graphs
+        np.testing.assert_allclose(fallback.activity_arr[:fallback.node_counter],
+                                   kernel.activity_arr[:kernel.node_counter])
+        np.testing.assert_allclose(fallback.edge_w_arr[:fallback._edge_slot_count],
+                                   kernel.edge_w_arr[:kernel._edge_slot_count], rtol=1e-5)
+        self.assertGreaterEqual(fallback.activity_arr[:fallback.node_counter].min(), DynamicGraph.MIN_ACTIVITY)
+
+
+if __name__ == "__main__":
+    unittest.main()
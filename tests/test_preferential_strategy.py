@@ -0,0 +1,47 @@
+import copy
+import random
+import unittest
+
+import networkx as nx
+
+from dynamic_walker.graph.dynamic_graph import DynamicGraph
+
+
+def _bridging_rate(component_bonus, trials=200):
+    """Fraction of attaches whose targets span more than one existing component."""
+    random.seed(1)
+    graph = DynamicGraph("preferential", initial_nodes=40, target_components=2, min_component_size=5,
+                         max_degree=30, component_bonus=component_bonus)
+    comp_of = {node: i for i, comp in enumerate(nx.connected_components(graph.G)) for node in comp}
+    
+    bridged = 0
+    for trial in range(trials):
+        random.seed(trial)
+        trial_graph = copy.deepcopy(graph)
+        new_node = trial_graph._add_node()
+        bridged += len({comp_of[n] for n in trial_graph.G.adj[new_node]}) > 1
+    return bridged / trials
+
+
+class TestPreferentialAttach(unittest.TestCase):
+    def test_component_bonus_favors_unjoined_components(self):
+        self.assertGreater(_bridging_rate(10.0), _bridging_rate(1.0) + 0.15)
+    
+    def test_attach_picks_distinct_targets(self):
+        random.seed(0)
+        graph = DynamicGraph("preferential", initial_nodes=40, max_degree=30)
+        new_node = graph._add_node()
+        self.assertEqual(graph.G.degree(new_node), 3)
+    
+    def test_attach_during_evolution(self):
+        random.seed(0)
+        graph = DynamicGraph("preferential", initial_nodes=30, target_components=3)
+        for _ in range(100):
+            graph.update({"node_add_prob": 0.5, "node_remove_prob": 0.1, "edge_remove_prob": 0.2})
+            # Warm the component cache the way component-teleporting walkers do between updates
+            graph.get_row_components()
+        self.assertEqual(graph.number_connected_components(), nx.number_connected_components(graph.G))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import random
+import unittest
+
+import networkx as nx
+
+from dynamic_walker.graph.dynamic_graph import DynamicGraph
+from dynamic_walker.graph.union_find import UnionFind
+
+
+class TestUnionFind(unittest.TestCase):
+    def test_union_and_count(self):
+        uf = UnionFind(5)
+        self.assertTrue(uf.union(0, 1))
+        self.assertTrue(uf.union(3, 4))
+        self.assertFalse(uf.union(1, 0))
+        self.assertEqual(uf.count, 3)
+        self.assertTrue(uf.connected(0, 1))
+        self.assertFalse(uf.connected(1, 3))
+    
+    def test_union_grows_the_forest(self):
+        uf = UnionFind()
+        uf.union(2, 6)
+        # Ids 0..6 exist, 2 and 6 share a set
+        self.assertEqual(len(uf.parent), 7)
+        self.assertEqual(uf.count, 6)
+
+
+class TestComponentCounts(unittest.TestCase):
+    def setUp(self):
+        random.seed(4)
+        self.graph = DynamicGraph("random", initial_nodes=40, target_components=2)
+    
+    def assertCountMatches(self):
+        self.assertEqual(self.graph.number_connected_components(), nx.number_connected_components(self.graph.G))
+    
+    def test_bridge_removal_splits(self):
+        graph = self.graph
+        before = graph.number_connected_components()
+        u, v = next(nx.bridges(graph.G))
+        graph._remove_edge(u, v)
+        self.assertEqual(graph.number_connected_components(), before + 1)
+        self.assertCountMatches()
+        # Reconnecting merges the two sides again
+        graph._add_edge(u, v)
+        self.assertEqual(graph.number_connected_components(), before)
+    
+    def test_cycle_edge_removal_keeps_union_find(self):
+        graph = self.graph
+        graph.number_connected_components()
+        bridges = {frozenset(edge) for edge in nx.bridges(graph.G)}
+        u, v = next(edge for edge in graph.G.edges() if frozenset(edge) not in bridges)
+        graph._remove_edge(u, v)
+        self.assertFalse(graph._uf_dirty)
+        self.assertCountMatches()
+    
+    def test_still_connected_matches_has_path(self):
+        graph = self.graph
+        rng = random.Random(0)
+        for _ in range(30):
+            u, v = rng.choice(list(graph.G.edges()))
+            graph._remove_edge(u, v)
+            self.assertEqual(graph._still_connected(u, v), nx.has_path(graph.G, u, v))
+            self.assertCountMatches()
+    
+    def test_node_removal_splits(self):
+        graph = self.graph
+        node = next(nx.articulation_points(graph.G))
+        graph.activity_arr[node] = 0.0
+        graph._remove_inactive_node()
+        self.assertNotIn(node, graph.G)
+        self.assertCountMatches()
+    
+    def test_counts_match_networkx_during_evolution(self):
+        params = {"node_add_prob": 0.3, "node_remove_prob": 0.2, "edge_remove_prob": 0.4}
+        for _ in range(100):
+            self.graph.update(params)
+            self.assertCountMatches()
+            components = self.graph._get_components()
+            self.assertEqual(sorted(map(sorted, components)),
+                             sorted(map(sorted, nx.connected_components(self.graph.G))))
+
+
+if __name__ == "__main__":
+    unittest.main()